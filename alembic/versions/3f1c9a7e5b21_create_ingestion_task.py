@@ -0,0 +1,48 @@
+"""create_ingestion_task
+
+Revision ID: 3f1c9a7e5b21
+Revises: 75da0e96be29
+Create Date: 2025-07-20 18:42:10.512374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7e5b21'
+down_revision: Union[str, Sequence[str], None] = '75da0e96be29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ingestiontask',
+                    sa.Column(
+                        'id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column(
+                        'tables', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column(
+                        'status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('files_done', sa.Integer(), nullable=False),
+                    sa.Column('rows_processed', sa.Integer(), nullable=False),
+                    sa.Column('rows_failed', sa.Integer(), nullable=False),
+                    sa.Column('error_count', sa.Integer(), nullable=False),
+                    sa.Column('elapsed_seconds', sa.Float(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=False),
+                    sa.Column('started_at', sa.DateTime(), nullable=True),
+                    sa.Column('finished_at', sa.DateTime(), nullable=True),
+                    sa.Column(
+                        'error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+                    sa.Column('result', sa.JSON(), nullable=True),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ingestiontask')
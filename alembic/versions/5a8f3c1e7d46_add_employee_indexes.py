@@ -0,0 +1,35 @@
+"""add_employee_indexes
+
+Revision ID: 5a8f3c1e7d46
+Revises: c4e7a2d9f015
+Create Date: 2025-07-25 16:48:09.217530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8f3c1e7d46'
+down_revision: Union[str, Sequence[str], None] = 'c4e7a2d9f015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_employee_hire_date'), 'employee',
+                    ['hire_date'], unique=False)
+    op.create_index(op.f('ix_employee_department_id'), 'employee',
+                    ['department_id'], unique=False)
+    op.create_index(op.f('ix_employee_job_id'), 'employee',
+                    ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employee_job_id'), table_name='employee')
+    op.drop_index(op.f('ix_employee_department_id'), table_name='employee')
+    op.drop_index(op.f('ix_employee_hire_date'), table_name='employee')
@@ -0,0 +1,39 @@
+"""create_ingested_object
+
+Revision ID: 8b2d4e6f1a93
+Revises: 3f1c9a7e5b21
+Create Date: 2025-07-22 09:15:43.871205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4e6f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7e5b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ingestedobject',
+                    sa.Column(
+                        'key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column(
+                        'etag', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('size', sa.Integer(), nullable=False),
+                    sa.Column('last_modified', sa.DateTime(), nullable=True),
+                    sa.Column('rows_loaded', sa.Integer(), nullable=False),
+                    sa.Column('loaded_at', sa.DateTime(), nullable=False),
+                    sa.PrimaryKeyConstraint('key')
+                    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ingestedobject')
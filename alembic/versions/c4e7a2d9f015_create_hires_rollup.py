@@ -0,0 +1,118 @@
+"""create_hires_rollup
+
+Revision ID: c4e7a2d9f015
+Revises: 8b2d4e6f1a93
+Create Date: 2025-07-24 11:03:27.640918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Table, MetaData
+from sqlalchemy.sql import text
+from sqlalchemy_views import CreateView, DropView
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a2d9f015'
+down_revision: Union[str, Sequence[str], None] = '8b2d4e6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HIRED_BY_QUARTER_VIEW = Table('vhiredbyquarter2021', MetaData())
+TOP_HIRING_VIEW = Table('vtophiringdepartments', MetaData())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    # The metrics views are replaced by a rollup table refreshed after employee loads
+    op.execute(DropView(HIRED_BY_QUARTER_VIEW, if_exists=True))
+    op.execute(DropView(TOP_HIRING_VIEW, if_exists=True))
+
+    op.create_table('hiresrollup',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('department_id', sa.Integer(), nullable=False),
+                    sa.Column('job_id', sa.Integer(), nullable=True),
+                    sa.Column('year', sa.Integer(), nullable=False),
+                    sa.Column('quarter', sa.Integer(), nullable=False),
+                    sa.Column('hires', sa.Integer(), nullable=False),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_hiresrollup_year_department_job', 'hiresrollup',
+                    ['year', 'department_id', 'job_id'], unique=False)
+
+    # Populate the rollup from the employees already loaded
+    op.execute(text("""
+        INSERT INTO hiresrollup (department_id, job_id, year, quarter, hires)
+        SELECT
+            e.department_id,
+            e.job_id,
+            EXTRACT(YEAR FROM e.hire_date)::integer AS year,
+            EXTRACT(QUARTER FROM e.hire_date)::integer AS quarter,
+            COUNT(*) AS hires
+        FROM employee e
+        WHERE e.department_id IS NOT NULL AND e.hire_date IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hiresrollup_year_department_job',
+                  table_name='hiresrollup')
+    op.drop_table('hiresrollup')
+
+    create_hired_by_quarter_view = CreateView(
+        HIRED_BY_QUARTER_VIEW,
+        text("""
+        WITH hires_2021 AS (
+            SELECT
+                e.department_id,
+                e.job_id,
+                EXTRACT(QUARTER FROM e.hire_date) AS quarter
+            FROM employee e
+            WHERE EXTRACT(YEAR FROM e.hire_date) = 2021
+        )
+        SELECT
+            d.department,
+            j.job,
+            COUNT(CASE WHEN h.quarter = 1 THEN 1 END) AS Q1,
+            COUNT(CASE WHEN h.quarter = 2 THEN 1 END) AS Q2,
+            COUNT(CASE WHEN h.quarter = 3 THEN 1 END) AS Q3,
+            COUNT(CASE WHEN h.quarter = 4 THEN 1 END) AS Q4
+        FROM hires_2021 h
+        JOIN department d ON h.department_id = d.id
+        JOIN job j ON h.job_id = j.id
+        GROUP BY d.department, j.job
+        ORDER BY d.department, j.job
+        """),
+        or_replace=True
+    )
+    op.execute(create_hired_by_quarter_view)
+
+    create_top_hiring_view = CreateView(
+        TOP_HIRING_VIEW,
+        text("""
+        WITH dept_hires_2021 AS (
+            SELECT
+                d.id,
+                d.department,
+                COUNT(e.id) as employees_hired
+            FROM department d
+            LEFT JOIN employee e ON d.id = e.department_id
+                AND EXTRACT(YEAR FROM e.hire_date) = 2021
+            GROUP BY d.id, d.department
+        )
+        SELECT
+            id,
+            department,
+            employees_hired
+        FROM dept_hires_2021
+        WHERE employees_hired > (SELECT AVG(employees_hired) FROM dept_hires_2021)
+        ORDER BY employees_hired DESC
+        """),
+        or_replace=True
+    )
+    op.execute(create_top_hiring_view)
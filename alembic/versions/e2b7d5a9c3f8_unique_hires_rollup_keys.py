@@ -0,0 +1,58 @@
+"""unique_hires_rollup_keys
+
+Revision ID: e2b7d5a9c3f8
+Revises: 5a8f3c1e7d46
+Create Date: 2025-07-28 10:14:52.306418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d5a9c3f8'
+down_revision: Union[str, Sequence[str], None] = '5a8f3c1e7d46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    # Concurrent refreshes may have stored duplicate rows, so rebuild the rollup before enforcing uniqueness
+    op.execute(text("DELETE FROM hiresrollup"))
+    op.execute(text("""
+        INSERT INTO hiresrollup (department_id, job_id, year, quarter, hires)
+        SELECT
+            e.department_id,
+            e.job_id,
+            EXTRACT(YEAR FROM e.hire_date)::integer AS year,
+            EXTRACT(QUARTER FROM e.hire_date)::integer AS quarter,
+            COUNT(*) AS hires
+        FROM employee e
+        WHERE e.department_id IS NOT NULL AND e.hire_date IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """))
+
+    # The unique index starts with the columns of the old one, so it serves the same lookups
+    op.drop_index('ix_hiresrollup_year_department_job',
+                  table_name='hiresrollup')
+    op.create_index('uq_hiresrollup_year_department_job_quarter', 'hiresrollup',
+                    ['year', 'department_id', 'job_id', 'quarter'], unique=True)
+    # NULLs are distinct in unique indexes, so employees without a job need their own
+    op.create_index('uq_hiresrollup_year_department_quarter_without_job', 'hiresrollup',
+                    ['year', 'department_id', 'quarter'], unique=True,
+                    postgresql_where=sa.text('job_id IS NULL'), sqlite_where=sa.text('job_id IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_hiresrollup_year_department_quarter_without_job',
+                  table_name='hiresrollup')
+    op.drop_index('uq_hiresrollup_year_department_job_quarter',
+                  table_name='hiresrollup')
+    op.create_index('ix_hiresrollup_year_department_job', 'hiresrollup',
+                    ['year', 'department_id', 'job_id'], unique=False)
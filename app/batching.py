@@ -0,0 +1,94 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Rows per batch of upsert loads, for tables without an entry in TABLE_BATCH_SIZES
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
+
+# Rows per batch by table name, e.g. "department=5000,job=5000,employee=1000"
+TABLE_BATCH_SIZES = {
+    table.strip(): int(size)
+    for table, _, size in (entry.partition("=") for entry in os.getenv("TABLE_BATCH_SIZES", "").split(","))
+    if table.strip()
+}
+
+# Bounds of the batch size, whether requested or chosen by adaptive batching
+MIN_BATCH_SIZE = int(os.getenv("MIN_BATCH_SIZE", "100"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "50000"))
+
+# Commit latency adaptive batching aims for, in seconds per batch
+ADAPTIVE_BATCH_TARGET_SECONDS = float(os.getenv("ADAPTIVE_BATCH_TARGET_SECONDS", "0.5"))
+
+# Rows added to the batch size after each batch committed faster than the target
+ADAPTIVE_BATCH_STEP = int(os.getenv("ADAPTIVE_BATCH_STEP", "500"))
+
+
+def initial_batch_size(table_name: str, requested: int | None = None) -> int:
+    """Batch size of a load: the requested one, else the table's TABLE_BATCH_SIZES entry, else BATCH_SIZE."""
+    if requested is not None:
+        return requested
+    return min(max(TABLE_BATCH_SIZES.get(table_name, BATCH_SIZE), MIN_BATCH_SIZE), MAX_BATCH_SIZE)
+
+
+class BatchSizer:
+    """
+    Batch size of one table load, shared by all its files and worker threads, along with the
+    number, sizes and write time of the batches it produced.
+
+    When adaptive, the size follows an additive-increase/multiplicative-decrease rule: each full
+    batch committed under target_seconds grows it by ADAPTIVE_BATCH_STEP rows; a slower batch
+    shrinks it in proportion to how far it overshot (at most by half), and a batch with rows
+    rejected by the database (constraint errors, lock timeouts, deadlocks) halves it.
+    """
+
+    def __init__(self, size: int, adaptive: bool = False, target_seconds: float | None = None):
+        self.initial = self.size = size
+        self.adaptive = adaptive
+        self.target_seconds = target_seconds or ADAPTIVE_BATCH_TARGET_SECONDS
+        self.smallest = self.largest = size
+        self.batches = 0
+        self.rows = 0
+        self.write_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self) -> int:
+        """Size of the next batch to cut."""
+        return self.size
+
+    def record(self, rows: int, seconds: float, database_failures: int = 0):
+        """Record a written batch: its rows, the seconds spent writing them and the rows the database rejected."""
+        with self.lock:
+            self.batches += 1
+            self.rows += rows
+            self.write_seconds += seconds
+            if not self.adaptive:
+                return
+            size = self.size
+            if database_failures:
+                size = size // 2
+            elif seconds > self.target_seconds:
+                size = int(size * max(self.target_seconds / seconds, 0.5))
+            # Partial batches (the end of a file, many invalid rows) say little about larger ones
+            elif rows >= size // 2:
+                size += ADAPTIVE_BATCH_STEP
+            size = min(max(size, MIN_BATCH_SIZE), MAX_BATCH_SIZE)
+            if size != self.size:
+                logger.debug(f"Batch size {self.size} -> {size} after {rows} rows in {seconds:.3f}s")
+                self.size = size
+                self.smallest = min(self.smallest, size)
+                self.largest = max(self.largest, size)
+
+    def stats(self) -> dict:
+        """Sizes chosen and write throughput observed, as reported in BatchResponse.batch_size."""
+        return {
+            "adaptive": self.adaptive,
+            "initial": self.initial,
+            "final": self.size,
+            "smallest": self.smallest,
+            "largest": self.largest,
+            "batches": self.batches,
+            "mean_rows": round(self.rows / self.batches, 1) if self.batches else None,
+            "write_rows_per_second": round(self.rows / self.write_seconds, 1) if self.write_seconds else None,
+        }
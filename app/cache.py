@@ -0,0 +1,158 @@
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from .models import CacheStatsResponse
+
+# Responses kept by the in-process metrics cache and how long they stay valid
+METRICS_CACHE_SIZE = int(os.getenv("METRICS_CACHE_SIZE", "256"))
+METRICS_CACHE_TTL_SECONDS = float(os.getenv("METRICS_CACHE_TTL_SECONDS", "300"))
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by ResponseCache. Subclasses can keep entries elsewhere (e.g. a shared store);
+    values are (body, etag) tuples and keys are hashable tuples. The backend also holds the
+    invalidation generation, so a backend shared between API workers must share it too
+    (e.g. a Redis INCR counter): a load in any worker then invalidates the entries of all of them.
+    """
+
+    @abstractmethod
+    def generation(self) -> int:
+        """Return the current invalidation generation."""
+
+    @abstractmethod
+    def bump(self):
+        """Increment the invalidation generation."""
+
+    @abstractmethod
+    def get(self, key: Hashable):
+        """Return the stored value, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value):
+        """Store a value."""
+
+    @abstractmethod
+    def clear(self):
+        """Remove all entries."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU cache whose entries expire after ttl_seconds."""
+
+    def __init__(self, max_entries: int = METRICS_CACHE_SIZE, ttl_seconds: float = METRICS_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.current_generation = 0
+        self.lock = threading.Lock()
+
+    def generation(self) -> int:
+        return self.current_generation
+
+    def bump(self):
+        with self.lock:
+            self.current_generation += 1
+            # Entries of older generations can never be read again
+            self.entries.clear()
+
+    def get(self, key: Hashable):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class ResponseCache:
+    """
+    Cache of serialized responses keyed by endpoint and parameters. Keys include the backend's
+    generation number, which invalidate() increments, so entries built before a data load are never
+    served again by any process sharing the backend.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def set_backend(self, backend: CacheBackend):
+        """Replace the storage backend, e.g. with one shared between API workers that also shares the generation."""
+        self.backend = backend
+
+    @property
+    def generation(self) -> int:
+        return self.backend.generation()
+
+    def invalidate(self):
+        """Mark every cached response as stale. Called whenever loaded data is committed."""
+        self.backend.bump()
+
+    def get(self, key: tuple) -> tuple[int, tuple[bytes, str] | None]:
+        """
+        Look up a response and count the hit or miss. Returns the current generation, to pass to put()
+        on a miss, and the cached (body, etag) or None.
+        """
+        generation = self.generation
+        cached = self.backend.get((generation, *key))
+        with self.lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return generation, cached
+
+    def put(self, generation: int, key: tuple, body: bytes) -> str:
+        """
+        Store a response built after get() missed and return its ETag. The ETag is derived from the body,
+        so it stays valid across expiry and restarts while the data is unchanged.
+        """
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        # Skip storing if a load committed while building, since the body may mix old and new data
+        if generation == self.generation:
+            self.backend.set((generation, *key), (body, etag))
+        return etag
+
+    def stats(self) -> CacheStatsResponse:
+        """Hit and miss counters and the current size of the cache."""
+        with self.lock:
+            requests = self.hits + self.misses
+            return CacheStatsResponse(
+                hits=self.hits,
+                misses=self.misses,
+                hit_ratio=round(self.hits / requests, 3) if requests else 0,
+                entries=len(self.backend),
+                generation=self.generation
+            )
+
+
+metrics_cache = ResponseCache(MemoryCacheBackend())
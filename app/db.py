@@ -1,10 +1,144 @@
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Annotated
 from fastapi import Depends
 import os
+import threading
+import time
+
+from .instrumentation import instrument_engine
+
+# Async drivers used for the read endpoints, by database backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+# Connection pool settings for the API (read) engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# PostgreSQL statement_timeout for every connection of the pool, 0 to disable
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+# Separate pool for batch loads, so ingestion cannot take the connections of the read endpoints
+INGEST_DB_POOL_SIZE = int(os.getenv("INGEST_DB_POOL_SIZE", "10"))
+INGEST_DB_MAX_OVERFLOW = int(os.getenv("INGEST_DB_MAX_OVERFLOW", "10"))
+INGEST_DB_STATEMENT_TIMEOUT_MS = int(
+    os.getenv("INGEST_DB_STATEMENT_TIMEOUT_MS", "0"))
+
+
+class _WaitTimingMixin:
+    """Records how many connections were checked out of the pool and how long callers waited for them."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self.stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self.stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict:
+        """Current pool usage and checkout wait statistics."""
+        with self.stats_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+                "wait_seconds_max": round(self.wait_seconds_max, 3),
+            }
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """QueuePool that records checkout waits."""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout waits."""
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Async URL for the read endpoints: ASYNC_DATABASE_URL if set, otherwise DATABASE_URL
+    with its driver replaced by the async one (asyncpg for PostgreSQL, aiosqlite for SQLite).
+    """
+    if os.getenv("ASYNC_DATABASE_URL"):
+        return os.getenv("ASYNC_DATABASE_URL")
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def engine_options(database_url: str, pool_size: int, max_overflow: int, statement_timeout_ms: int) -> dict:
+    """Keyword arguments for create_engine/create_async_engine with the configured pool and timeouts."""
+    url = make_url(database_url)
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if url.get_dialect().is_async else InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.get_backend_name() == "postgresql" and statement_timeout_ms > 0:
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {
+                "statement_timeout": str(statement_timeout_ms)}}
+        else:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={statement_timeout_ms}"}
+    return options
+
 
 # Use the database URL from the environment variable
-engine = create_engine(os.getenv("DATABASE_URL"))
+engine = create_engine(os.getenv("DATABASE_URL"), **engine_options(
+    os.getenv("DATABASE_URL"), DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_STATEMENT_TIMEOUT_MS))
+
+# Engine for batch loads and background ingestion tasks
+ingest_engine = create_engine(os.getenv("DATABASE_URL"), **engine_options(
+    os.getenv("DATABASE_URL"), INGEST_DB_POOL_SIZE, INGEST_DB_MAX_OVERFLOW, INGEST_DB_STATEMENT_TIMEOUT_MS))
+
+# Async engine for the list, metrics and health endpoints, so concurrent requests do not block the event loop
+async_engine = create_async_engine(get_async_database_url(os.getenv("DATABASE_URL")), **engine_options(
+    get_async_database_url(os.getenv("DATABASE_URL")), DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_STATEMENT_TIMEOUT_MS))
+
+
+instrument_engine(engine, "read")
+instrument_engine(ingest_engine, "ingest")
+instrument_engine(async_engine.sync_engine, "read_async")
+
+
+def pool_stats() -> dict:
+    """Pool statistics of every engine, by engine name."""
+    return {
+        "read": engine.pool.stats(),
+        "read_async": async_engine.sync_engine.pool.stats(),
+        "ingest": ingest_engine.pool.stats(),
+    }
 
 
 def get_session():
@@ -16,4 +150,24 @@ def get_session():
         yield session
 
 
+def get_ingest_session():
+    """
+    Dependency that provides a SQLModel session on the ingestion pool.
+    Yields a session to be used by the batch endpoints.
+    """
+    with Session(ingest_engine) as session:
+        yield session
+
+
+async def get_async_session():
+    """
+    Dependency that provides an async SQLModel session for read endpoints.
+    Yields a session whose queries are awaited instead of blocking the event loop.
+    """
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_session)]
+IngestSessionDep = Annotated[Session, Depends(get_ingest_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
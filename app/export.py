@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+
+from .db import engine
+from .models import ExportFormat
+
+# Rows fetched from the server-side cursor and written to the response at a time
+EXPORT_CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode_ndjson(columns: list, rows) -> str:
+    return "".join(json.dumps(dict(zip(columns, row)), default=_json_value) + "\n" for row in rows)
+
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([value.isoformat() if isinstance(value, (datetime, date)) else value
+                      for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def iter_export(statement, export_format: ExportFormat) -> Iterator[str]:
+    """
+    Run a query and yield its rows encoded as NDJSON or CSV (with a header row), EXPORT_CHUNK_ROWS at a time.
+    Rows are read through a server-side cursor on its own session, so memory use does not depend on the result size.
+    """
+    with Session(engine) as session:
+        result = session.execute(statement.execution_options(
+            yield_per=EXPORT_CHUNK_ROWS))
+        columns = list(result.keys())
+        if export_format == ExportFormat.CSV:
+            yield _encode_csv([columns])
+        for rows in result.partitions():
+            yield _encode_ndjson(columns, rows) if export_format == ExportFormat.NDJSON else _encode_csv(rows)
+
+
+def export_response(statement, export_format: ExportFormat, name: str) -> StreamingResponse:
+    """Stream the rows of a query as a downloadable NDJSON or CSV file."""
+    return StreamingResponse(
+        iter_export(statement, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'}
+    )
+
+
+def table_statement(model_class, min_id: int | None = None, max_id: int | None = None, start_date: date | None = None, end_date: date | None = None):
+    """
+    Query of all columns of a table ordered by id, optionally limited to an inclusive id range and,
+    for employees, to hire dates between start_date and end_date (inclusive).
+    """
+    table = model_class.__table__
+    statement = select(table).order_by(table.c.id)
+    if min_id is not None:
+        statement = statement.where(table.c.id >= min_id)
+    if max_id is not None:
+        statement = statement.where(table.c.id <= max_id)
+    if start_date is not None:
+        statement = statement.where(table.c.hire_date >= datetime.combine(
+            start_date, datetime.min.time()))
+    if end_date is not None:
+        statement = statement.where(table.c.hire_date < datetime.combine(
+            end_date + timedelta(days=1), datetime.min.time()))
+    return statement
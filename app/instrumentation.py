@@ -0,0 +1,117 @@
+import time
+from collections.abc import Iterable, Iterator
+from contextvars import ContextVar
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Route template of the request being served, used to label database query latency
+current_route: ContextVar[str] = ContextVar("current_route", default="background")
+
+INGEST_ROWS = Counter(
+    "ingest_rows_total", "CSV rows processed by batch loads, by outcome (read, validated, inserted, updated, failed)",
+    ["table", "outcome"])
+INGEST_FILES = Counter(
+    "ingest_files_total", "CSV files handled by batch loads, by outcome (loaded, failed, skipped)",
+    ["table", "outcome"])
+INGEST_IN_FLIGHT = Gauge(
+    "ingest_in_flight", "Batch loads currently running", ["table"])
+INGEST_BATCH_COMMIT_SECONDS = Histogram(
+    "ingest_batch_commit_seconds", "Time to upsert and commit one batch", ["table"])
+INGEST_VALIDATION_SECONDS = Histogram(
+    "ingest_validation_seconds", "Time to validate one batch", ["table"])
+INGEST_STAGE_SECONDS = Histogram(
+    "ingest_file_stage_seconds", "Busy time of each load stage per file (download, parse_validate, write, copy, merge, *_wait)",
+    ["table", "stage"])
+S3_DOWNLOAD_BYTES = Counter(
+    "s3_download_bytes_total", "Bytes read from S3 objects by batch loads", ["table"])
+S3_OBJECT_DOWNLOAD_SECONDS = Histogram(
+    "s3_object_download_seconds", "Time spent reading each S3 object", ["table"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"])
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Database statement latency by engine and route", ["engine", "route"])
+
+
+def record_validation(table: str, rows: int, valid_rows: int, seconds: float | None = None):
+    """Count the rows read and validated and, for upsert batches, the time spent validating them."""
+    INGEST_ROWS.labels(table, "read").inc(rows)
+    INGEST_ROWS.labels(table, "validated").inc(valid_rows)
+    if seconds is not None:
+        INGEST_VALIDATION_SECONDS.labels(table).observe(seconds)
+
+
+def record_write(table: str, inserted: int, updated: int, failed: int, seconds: float | None = None):
+    """Count written and failed rows and, for upsert batches, the commit latency."""
+    INGEST_ROWS.labels(table, "inserted").inc(inserted)
+    INGEST_ROWS.labels(table, "updated").inc(updated)
+    INGEST_ROWS.labels(table, "failed").inc(failed)
+    if seconds is not None:
+        INGEST_BATCH_COMMIT_SECONDS.labels(table).observe(seconds)
+
+
+def record_file(table: str, outcome: str, timings: dict | None = None):
+    """Count a processed file and observe the busy time of each of its stages."""
+    INGEST_FILES.labels(table, outcome).inc()
+    for stage, seconds in (timings or {}).items():
+        INGEST_STAGE_SECONDS.labels(table, stage).observe(seconds)
+    if timings and "download" in timings:
+        S3_OBJECT_DOWNLOAD_SECONDS.labels(table).observe(timings["download"])
+
+
+def record_skipped_files(table: str, count: int):
+    """Count files skipped by an incremental load."""
+    INGEST_FILES.labels(table, "skipped").inc(count)
+
+
+def count_bytes(chunks: Iterable[bytes], table: str) -> Iterator[bytes]:
+    """Yield S3 body chunks, counting their size as they are read."""
+    counter = S3_DOWNLOAD_BYTES.labels(table)
+    for chunk in chunks:
+        counter.inc(len(chunk))
+        yield chunk
+
+
+def instrument_engine(engine, name: str):
+    """Observe the latency of every statement run on a (sync) engine."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.labels(name, current_route.get()).observe(
+            time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+async def record_request(request: Request, call_next):
+    """HTTP middleware observing request latency by route template and labelling the queries it runs."""
+    route = "unmatched"
+    for candidate in request.app.router.routes:
+        match, _ = candidate.matches(request.scope)
+        if match == Match.FULL:
+            route = candidate.path
+            break
+    token = current_route.set(route)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.labels(request.method, route, str(status)).observe(
+            time.perf_counter() - started)
+        current_route.reset(token)
+
+
+def latest_metrics() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
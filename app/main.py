@@ -1,11 +1,13 @@
 from .routers import departments, health_checks
-from .routers import departments, employees, health_checks, jobs, all_tables, metrics
+from .routers import departments, employees, health_checks, jobs, all_tables, metrics, tasks, diagnostics
 from fastapi import FastAPI
+from .instrumentation import record_request
 import os
 
 
 # Create FastAPI app
 app = FastAPI()
+app.middleware("http")(record_request)
 
 app.include_router(health_checks.router)
 app.include_router(departments.router)
@@ -13,6 +15,8 @@ app.include_router(jobs.router)
 app.include_router(employees.router)
 app.include_router(all_tables.router)
 app.include_router(metrics.router)
+app.include_router(tasks.router)
+app.include_router(diagnostics.router)
 
 
 @app.get("/")
@@ -32,7 +36,11 @@ async def root():
                 "jobs": "/jobs",
                 "employees": "/employees",
                 "all_tables": "/all-tables",
+                "tasks": "/tasks/{task_id}",
+                "diagnostics_pools": "/diagnostics/pools",
+                "prometheus_metrics": "/metrics-prom",
                 "metrics": {
+                    "hired_by_quarter": "/metrics/hired-by-quarter",
                     "hired_by_quarter_2021": "/metrics/hired-by-quarter-2021",
                     "top_hiring_departments": "/metrics/top-hiring-departments"
                 }
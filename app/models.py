@@ -1,6 +1,10 @@
 from datetime import datetime
+from enum import Enum
+from sqlalchemy import JSON, Column, Index, text
 from sqlmodel import SQLModel, Field, Relationship
 
+from .batching import MAX_BATCH_SIZE, MIN_BATCH_SIZE
+
 
 class DepartmentBase(SQLModel):
     """Base model for Department entity"""
@@ -28,10 +32,11 @@ class EmployeeBase(SQLModel):
     """Base model for Employee entity"""
     id: int | None = Field(default=None, primary_key=True)
     name: str | None = Field(default=None)
-    hire_date: datetime | None = Field(default=None)
+    hire_date: datetime | None = Field(default=None, index=True)
     department_id: int | None = Field(
-        default=None, foreign_key="department.id")
-    job_id: int | None = Field(default=None, foreign_key="job.id")
+        default=None, foreign_key="department.id", index=True)
+    job_id: int | None = Field(
+        default=None, foreign_key="job.id", index=True)
 
 
 class Employee(EmployeeBase, table=True):
@@ -54,6 +59,65 @@ class S3HealthResponse(SQLModel):
     error: str | None = None
 
 
+class LoadMode(str, Enum):
+    """Strategy used to write CSV rows into the database."""
+    UPSERT = "upsert"
+    COPY = "copy"
+
+
+class ExportFormat(str, Enum):
+    """Output format of the export endpoints."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class LoadOptions(SQLModel):
+    """Options controlling how CSV files are loaded into a table."""
+    mode: LoadMode = LoadMode.UPSERT
+    workers: int = Field(default=1, ge=1)
+    queue_depth: int | None = Field(default=None, ge=0)
+    incremental: bool = False
+    recover_rows: bool = True
+    batch_size: int | None = Field(default=None, ge=MIN_BATCH_SIZE, le=MAX_BATCH_SIZE)
+    adaptive_batch_size: bool = False
+    target_commit_seconds: float | None = Field(default=None, gt=0)
+
+
+class FailurePolicy(str, Enum):
+    """What a multi-table load does with the remaining tables when one of them fails."""
+    CONTINUE = "continue"
+    FAIL_FAST = "fail_fast"
+
+
+class BatchOptions(LoadOptions):
+    """Query options for batch processing endpoints."""
+    background: bool = False
+
+
+class AllTablesBatchOptions(BatchOptions):
+    """Query options for the all-tables batch endpoint."""
+    on_failure: FailurePolicy = FailurePolicy.CONTINUE
+
+
+class BatchSizeStats(SQLModel):
+    """Model for the batch sizes used by an upsert load and its write throughput"""
+    adaptive: bool
+    initial: int
+    final: int
+    smallest: int
+    largest: int
+    batches: int
+    mean_rows: float | None = None
+    write_rows_per_second: float | None = None
+
+
+class ErrorClassSummary(SQLModel):
+    """Model for the rows of a load rejected with one class of error"""
+    error_class: str
+    count: int
+    samples: list[dict] = []
+
+
 class BatchResponse(SQLModel):
     """Model for batch processing response."""
     table: str | None = None
@@ -62,25 +126,82 @@ class BatchResponse(SQLModel):
     updated: int
     failed: int
     errors:  list[dict] = []
+    error_summary: list[ErrorClassSummary] = []
+    rejects_file: str | None = None
     processed_files: list[str] | None = None
+    skipped_files: list[str] | None = None
+    stage_timings: dict[str, float] | None = None
+    elapsed_seconds: float | None = None
+    rows_per_second: float | None = None
+    batch_size: BatchSizeStats | None = None
+
+
+class IngestedObject(SQLModel, table=True):
+    """Model for the manifest of CSV objects already loaded into the database"""
+    key: str = Field(primary_key=True)
+    etag: str
+    size: int
+    last_modified: datetime | None = Field(default=None)
+    rows_loaded: int
+    loaded_at: datetime
+
+
+class TaskStatus(str, Enum):
+    """Lifecycle states of a background ingestion task."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class IngestionTaskBase(SQLModel):
+    """Base model for background ingestion tasks"""
+    id: str = Field(primary_key=True)
+    tables: str
+    status: str = Field(default=TaskStatus.PENDING.value)
+    files_done: int = Field(default=0)
+    rows_processed: int = Field(default=0)
+    rows_failed: int = Field(default=0)
+    error_count: int = Field(default=0)
+    elapsed_seconds: float = Field(default=0)
+    created_at: datetime
+    started_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
+    error: str | None = Field(default=None)
+
+
+class IngestionTask(IngestionTaskBase, table=True):
+    """Model for background ingestion tasks started from batch endpoints"""
+    result: list[dict] | None = Field(default=None, sa_column=Column(JSON))
+
+
+class IngestionTaskResponse(IngestionTaskBase):
+    """Model for background ingestion task status response."""
+    rows_per_second: float = 0
+    result: list[BatchResponse] | None = None
 
 
 # View Models for Metrics
-class VHiredByQuarter2021(SQLModel, table=True):
-    """Model for VHiredByQuarter2021 view"""
-    department: str = Field(default=None, primary_key=True)
-    job: str = Field(default=None, primary_key=True)
-    q1: int = Field(default=None)
-    q2: int = Field(default=None)
-    q3: int = Field(default=None)
-    q4: int = Field(default=None)
-
-
-class VTopHiringDepartments(SQLModel, table=True):
-    """Model for VTopHiringDepartments view"""
-    id: int = Field(primary_key=True)
-    department: str = Field(default=None)
-    employees_hired: int = Field(default=None)
+class HiresRollup(SQLModel, table=True):
+    """
+    Employees hired per department, job and quarter. Maintained by MetricsService
+    after employee loads so the metrics endpoints never aggregate the employee table.
+    """
+    __table_args__ = (
+        Index("uq_hiresrollup_year_department_job_quarter",
+              "year", "department_id", "job_id", "quarter", unique=True),
+        # NULLs are distinct in unique indexes, so employees without a job need their own
+        Index("uq_hiresrollup_year_department_quarter_without_job",
+              "year", "department_id", "quarter", unique=True,
+              postgresql_where=text("job_id IS NULL"), sqlite_where=text("job_id IS NULL")),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    department_id: int
+    job_id: int | None = Field(default=None)
+    year: int
+    quarter: int
+    hires: int = 0
 
 
 class MetricsResponse(SQLModel):
@@ -89,3 +210,33 @@ class MetricsResponse(SQLModel):
     limit: int = 10
     count: int
     data: list[dict]
+    next_cursor: str | None = None
+
+
+class CacheStatsResponse(SQLModel):
+    """Model for metrics cache statistics"""
+    hits: int
+    misses: int
+    hit_ratio: float
+    entries: int
+    generation: int
+
+
+class PoolStats(SQLModel):
+    """Model for the usage of one connection pool"""
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class PoolStatsResponse(SQLModel):
+    """Model for connection pool diagnostics response"""
+    read: PoolStats
+    read_async: PoolStats
+    ingest: PoolStats
@@ -0,0 +1,52 @@
+import base64
+import json
+from fastapi import HTTPException, Response
+from sqlmodel import select
+
+# Largest page size accepted by the list and metrics endpoints
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(values: list) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor token."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type | tuple[type, ...]) -> list:
+    """
+    Decode a cursor token into its sort key values, one per type given (e.g. int, or (str, type(None))).
+    Raises a 400 error for malformed tokens and for values of other types, which the database would reject.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(
+            cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != len(types) or not all(
+            isinstance(value, expected) and not isinstance(value, bool) for value, expected in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+async def list_page(session, model_class, response: Response, page: int, limit: int, after_id: int | None = None, cursor: str | None = None) -> list:
+    """
+    Return a page of rows ordered by id, using an async session. With after_id or cursor the page starts after that id
+    (keyset pagination, constant cost at any depth); otherwise page/limit offsets are used.
+    The cursor of the next page is returned in the X-Next-Cursor header when the page is full.
+    """
+    if cursor is not None:
+        if after_id is not None:
+            raise HTTPException(
+                status_code=400, detail="Use either after_id or cursor, not both")
+        after_id = decode_cursor(cursor, int)[0]
+
+    statement = select(model_class).order_by(model_class.id).limit(limit)
+    if after_id is not None:
+        statement = statement.where(model_class.id > after_id)
+    else:
+        statement = statement.offset((page - 1) * limit)
+    rows = (await session.exec(statement)).all()
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor([rows[-1].id])
+    return rows
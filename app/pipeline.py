@@ -0,0 +1,78 @@
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+
+# Polling interval used so blocked stages notice cancellation
+QUEUE_POLL_SECONDS = 0.1
+
+_END_OF_STAGE = object()
+
+
+class StageError:
+    """Wraps an exception raised in a stage thread so the next stage can re-raise it."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def put_item(output: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, blocking while it is full. Returns False if the pipeline was stopped."""
+    while not stop.is_set():
+        try:
+            output.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def iter_queue(source: queue.Queue, stop: threading.Event) -> Iterator:
+    """Yield items from a stage queue until the upstream stage finishes, re-raising upstream errors."""
+    while not stop.is_set():
+        try:
+            item = source.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        if item is _END_OF_STAGE:
+            return
+        if isinstance(item, StageError):
+            raise item.error
+        yield item
+
+
+def timed(items: Iterable, timings: dict, stage: str, upstream: str | None = None) -> Iterator:
+    """
+    Yield from items, adding the time spent producing each item to timings[stage].
+    Time recorded under the upstream key while producing an item is not counted for this stage.
+    """
+    iterator = iter(items)
+    while True:
+        started = time.perf_counter()
+        upstream_before = timings.get(upstream, 0.0)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            elapsed = time.perf_counter() - started
+            if upstream:
+                elapsed -= timings.get(upstream, 0.0) - upstream_before
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+        yield item
+
+
+def start_stage(name: str, items: Iterable, output: queue.Queue, stop: threading.Event) -> threading.Thread:
+    """Start a thread that iterates items and forwards them to the output queue."""
+    def run():
+        try:
+            for item in items:
+                if not put_item(output, item, stop):
+                    return
+            put_item(output, _END_OF_STAGE, stop)
+        except Exception as e:
+            put_item(output, StageError(e), stop)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+# Seconds the ids of a referenced table are reused before they are read again. Loads through this
+# process invalidate them on commit; the TTL bounds staleness from writes made elsewhere
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+# A bitmap is used while it takes at most this many bits per id, otherwise a frozenset
+MAX_BITMAP_BITS_PER_ID = 64
+
+# Uncached ids looked up per query before rows referencing them are rejected
+MISSING_ID_LOOKUP_SIZE = 1000
+
+
+class IdSet:
+    """Immutable set of integer ids, stored as a bitmap when the ids are dense enough."""
+
+    def __init__(self, ids: Iterable[int]):
+        ids = list(ids)
+        self.count = len(ids)
+        self.max_id = max(ids, default=-1)
+        if ids and min(ids) >= 0 and self.max_id < self.count * MAX_BITMAP_BITS_PER_ID:
+            self.bits = bytearray(self.max_id // 8 + 1)
+            for value in ids:
+                self.bits[value >> 3] |= 1 << (value & 7)
+            self.ids = None
+        else:
+            self.bits = None
+            self.ids = frozenset(ids)
+
+    def __contains__(self, value) -> bool:
+        if self.bits is None:
+            return value in self.ids
+        return isinstance(value, int) and 0 <= value <= self.max_id and bool(self.bits[value >> 3] & (1 << (value & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ReferencedIds:
+    """
+    Cached ids of a referenced column. The cache may miss ids written by other processes,
+    so ids it does not hold are looked up in the database before they are reported missing.
+    """
+
+    def __init__(self, cache: "ReferenceCache", bind, column, ids: IdSet):
+        self.cache = cache
+        self.bind = bind
+        self.column = column
+        self.table_name = column.table.name
+        self.ids = ids
+
+    def missing(self, values: Iterable) -> set:
+        """Return the values that do not exist in the referenced column, with one query per MISSING_ID_LOOKUP_SIZE uncached values."""
+        unknown = sorted({value for value in values if value not in self.ids})
+        if not unknown:
+            return set()
+        found = set()
+        with self.bind.connect() as connection:
+            for start in range(0, len(unknown), MISSING_ID_LOOKUP_SIZE):
+                found.update(connection.execute(select(self.column).where(
+                    self.column.in_(unknown[start:start + MISSING_ID_LOOKUP_SIZE]))).scalars())
+        if found:
+            # Rows were written elsewhere since the ids were cached; read them again for the next batch
+            logger.info(f"Cached ids of table '{self.table_name}' are stale; {len(found)} ids were found in the database")
+            self.cache.invalidate(self.table_name)
+        return set(unknown) - found
+
+
+class ReferenceCache:
+    """
+    Ids of the tables referenced by foreign keys, so loads can reject rows with unknown references
+    before writing them instead of failing the whole batch. Ids are read once per table and reused
+    until a load commits rows into that table, REFERENCE_CACHE_TTL_SECONDS pass or a lookup finds
+    ids the cache did not hold.
+    """
+
+    def __init__(self, ttl_seconds: float = REFERENCE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def ids(self, bind, column) -> IdSet:
+        """Values of a referenced column (usually a primary key), read through bind (an engine) when they are not cached."""
+        key = (column.table.name, column.name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
+            # Keep the lock while reading, so concurrent batches wait for one query instead of each running it
+            with bind.connect() as connection:
+                ids = IdSet(connection.execute(select(column).where(column.is_not(None))).scalars())
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, ids)
+            logger.info(f"Cached {len(ids)} ids of table '{column.table.name}'")
+            return ids
+
+    def references(self, bind, model_class) -> dict[str, ReferencedIds]:
+        """Map each foreign key column of a model to the ids of the column it references."""
+        references = {}
+        for column in model_class.__table__.columns:
+            for foreign_key in column.foreign_keys:
+                references[column.name] = ReferencedIds(
+                    self, bind, foreign_key.column, self.ids(bind, foreign_key.column))
+        return references
+
+    def invalidate(self, table_name: str):
+        """Forget the ids of a table after rows were written into it."""
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == table_name]:
+                del self.entries[key]
+
+
+reference_cache = ReferenceCache()
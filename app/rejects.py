@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Where loads spool the rows they reject, one NDJSON file per table load under <Model>/:
+# file:///path/ or s3://bucket/prefix/. Set it to an empty value to only keep the summary
+REJECTS_URI = os.getenv("REJECTS_URI", f"file://{os.path.join(tempfile.gettempdir(), 'rejects')}/")
+
+# Rejected rows kept per error class in BatchResponse.error_summary
+REJECT_SAMPLES_PER_CLASS = int(os.getenv("REJECT_SAMPLES_PER_CLASS", "5"))
+
+
+class LocalRejectSpool:
+    """Reject file on a local or mounted directory, appended to as rows are rejected."""
+
+    def __init__(self, uri: str, key: str):
+        self.path = os.path.join(unquote(urlsplit(uri).path), key)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, "ab")
+
+    @property
+    def location(self) -> str:
+        return f"file://{self.path}"
+
+    def write(self, data: bytes):
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+    def abort(self):
+        """Discard the incomplete file."""
+        self.file.close()
+        os.remove(self.path)
+
+
+# Reject spools by URI scheme. The S3 spool is registered by the services module, which owns the S3 client
+REJECT_SPOOLS = {
+    "file": LocalRejectSpool,
+}
+
+
+class RejectCollector:
+    """
+    Rows rejected by one table load. Every rejected row is written to a reject file as soon as it is
+    collected, while only a count and the first REJECT_SAMPLES_PER_CLASS rows per error class stay in
+    memory, so a file full of bad rows does not grow the response or the process.
+    The reject file is created on the first rejected row.
+    """
+
+    def __init__(self, model_name: str, uri: str | None = REJECTS_URI, samples_per_class: int = REJECT_SAMPLES_PER_CLASS):
+        self.uri = uri
+        started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.key = f"{model_name}/{started}-{uuid.uuid4().hex[:8]}.ndjson"
+        self.samples_per_class = samples_per_class
+        self.classes = {}
+        self.spool = None
+        self.spool_error = None
+        self.location = None
+        self.lock = threading.Lock()
+
+    def add(self, csv_file: str, errors: list[dict]) -> list[dict]:
+        """
+        Collect the row errors (those with a "row") of a CSV file and return the other errors,
+        such as file and batch failures, which are few and reported in full.
+        """
+        other_errors = []
+        lines = []
+        with self.lock:
+            for error in errors:
+                if "row" not in error:
+                    other_errors.append(error)
+                    continue
+                error_class = error.get("error_class", "invalid_row")
+                entry = self.classes.setdefault(error_class, {"error_class": error_class, "count": 0, "samples": []})
+                entry["count"] += 1
+                if len(entry["samples"]) < self.samples_per_class:
+                    entry["samples"].append({"file": csv_file, "row": error["row"], "error": error["error"]})
+                if self.uri:
+                    lines.append(json.dumps({"file": csv_file, "error_class": error_class,
+                                             "error": error["error"], "row": error["row"]}, default=str))
+            if lines:
+                self._write("".join(line + "\n" for line in lines).encode())
+        return other_errors
+
+    def _write(self, data: bytes):
+        if self.spool_error is not None:
+            return
+        try:
+            if self.spool is None:
+                scheme = urlsplit(self.uri).scheme
+                if scheme not in REJECT_SPOOLS:
+                    raise ValueError(f"Unsupported rejects URI '{self.uri}'; use one of: " +
+                                     ", ".join(f"{name}://" for name in REJECT_SPOOLS))
+                self.spool = REJECT_SPOOLS[scheme](self.uri, self.key)
+                self.location = self.spool.location
+            self.spool.write(data)
+        except Exception as e:
+            # Counts and samples are still reported; only the full list of rejected rows is lost
+            logger.error(f"Could not spool rejected rows to '{self.uri}': {e}")
+            self.spool_error = str(e)
+
+    @property
+    def rejected(self) -> int:
+        """Number of rows collected so far."""
+        return sum(entry["count"] for entry in self.classes.values())
+
+    def summary(self) -> list[dict]:
+        """Count and sample rows of each error class, most frequent first."""
+        return sorted(self.classes.values(), key=lambda entry: -entry["count"])
+
+    def close(self) -> str | None:
+        """
+        Finish the reject file and return its location, if any rows were spooled. A file that missed
+        rows because a write failed is discarded rather than left behind truncated.
+        """
+        with self.lock:
+            if self.spool is not None:
+                try:
+                    if self.spool_error is None:
+                        self.spool.close()
+                    else:
+                        self.spool.abort()
+                except Exception as e:
+                    logger.error(f"Could not finish the reject file '{self.location}': {e}")
+                    self.spool_error = self.spool_error or str(e)
+                self.spool = None
+            return self.location if self.spool_error is None else None
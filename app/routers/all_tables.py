@@ -1,9 +1,10 @@
-from fastapi import APIRouter, status, HTTPException
+from fastapi import APIRouter, status, HTTPException, Query, Response
+from typing import Annotated
 import logging
 
-from ..models import Department, Employee, Job, BatchResponse
-from ..services import DatabaseService
-from ..db import SessionDep
+from ..models import Department, Employee, Job, BatchResponse, IngestionTaskResponse, AllTablesBatchOptions
+from ..scheduler import load_tables
+from ..tasks import IngestionTaskService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Order matters: Department and Job must be processed before Employee due to foreign key relationships
+# Tables loaded by /all-tables/batch; the load order follows their foreign keys, so Employee waits for Department and Job
 MODEL_MAP = {
     "Department": Department,
     "Job": Job,
@@ -19,14 +20,19 @@ MODEL_MAP = {
 }
 
 
-@router.post("/all-tables/batch", response_model=list[BatchResponse], status_code=status.HTTP_201_CREATED, tags=["all-tables"])
-async def batch_upsert_all_tables(session: SessionDep):
+@router.post("/all-tables/batch", response_model=list[BatchResponse] | IngestionTaskResponse, status_code=status.HTTP_201_CREATED, tags=["all-tables"])
+def batch_upsert_all_tables(response: Response, options: Annotated[AllTablesBatchOptions, Query()]):
     """
     Process all CSV files and upsert data into all tables.
-    Processes departments.csv, jobs.csv, and hired_employees.csv in sequence.
+    Departments and jobs are loaded concurrently, and employees as soon as both have finished.
+    With on_failure=fail_fast, a failed table load skips the tables that have not started yet.
+    With background=true the load runs as a background task and the task is returned immediately.
     """
     try:
-        return [DatabaseService.batch_upsert(session, model_class) for _, model_class in MODEL_MAP.items()]
+        if options.background:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return IngestionTaskService.submit(list(MODEL_MAP.values()), options, options.on_failure)
+        return load_tables(list(MODEL_MAP.values()), options, options.on_failure)
 
     except Exception as e:
         logger.error(f"Error processing all tables: {e}")
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Response
+import logging
+
+from ..models import PoolStatsResponse
+from ..db import pool_stats
+from ..instrumentation import latest_metrics
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/diagnostics/pools", response_model=PoolStatsResponse, tags=["diagnostics"])
+async def get_pool_stats():
+    """
+    Connection pool usage of the read, async read and ingestion engines, including
+    how many checkouts waited, timed out, and the total and longest wait in seconds.
+    """
+    return pool_stats()
+
+
+@router.get("/metrics-prom", tags=["diagnostics"])
+async def prometheus_metrics():
+    """
+    Ingestion, S3, request and database query metrics in the Prometheus text format.
+    """
+    content, media_type = latest_metrics()
+    return Response(content=content, media_type=media_type)
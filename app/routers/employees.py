@@ -1,10 +1,14 @@
-from fastapi import APIRouter, status, HTTPException, Query
-from sqlmodel import select
+from datetime import date
+from fastapi import APIRouter, status, HTTPException, Query, Response
+from typing import Annotated
 import logging
 
-from ..models import Employee, BatchResponse
+from ..models import Employee, ExportFormat, BatchResponse, IngestionTaskResponse, BatchOptions
 from ..services import DatabaseService
-from ..db import SessionDep
+from ..tasks import IngestionTaskService
+from ..db import AsyncSessionDep, IngestSessionDep
+from ..export import export_response, table_statement
+from ..pagination import MAX_PAGE_LIMIT, list_page
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,14 +17,18 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.post("/employees/batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED, tags=["employees"])
-async def batch_upsert_employees(session: SessionDep):
+@router.post("/employees/batch", response_model=BatchResponse | IngestionTaskResponse, status_code=status.HTTP_201_CREATED, tags=["employees"])
+def batch_upsert_employees(session: IngestSessionDep, response: Response, options: Annotated[BatchOptions, Query()]):
     """
     Batch upsert employees from CSV files in S3 into the database.
     Creates or updates employee records in bulk.
+    With background=true the load runs as a background task and the task is returned immediately.
     """
     try:
-        return DatabaseService.batch_upsert(session, Employee)
+        if options.background:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return IngestionTaskService.submit([Employee], options)
+        return DatabaseService.batch_upsert(session, Employee, options)
 
     except Exception as e:
         logger.error(f"Error processing employees: {e}")
@@ -28,13 +36,17 @@ async def batch_upsert_employees(session: SessionDep):
 
 
 @router.get("/employees", response_model=list[Employee], tags=["employees"])
-async def list_employees(session: SessionDep, page: int = Query(1, ge=1), limit: int = Query(10, le=100)):
+async def list_employees(session: AsyncSessionDep, response: Response, page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT), after_id: int | None = None, cursor: str | None = None):
     """
     List employees with pagination.
+    Pass after_id, or the X-Next-Cursor header of the previous page as cursor, to page by id instead of page number.
     """
-    offset = (page - 1) * limit
-    statement = select(Employee).order_by(
-        Employee.id).offset(offset).limit(limit)
-    results = session.exec(statement)
-    employees = results.all()
-    return employees
+    return await list_page(session, Employee, response, page, limit, after_id, cursor)
+
+
+@router.get("/employees/export", tags=["employees"])
+def export_employees(format: ExportFormat = ExportFormat.NDJSON, min_id: int | None = None, max_id: int | None = None, start_date: date | None = None, end_date: date | None = None):
+    """
+    Stream all employees as NDJSON or CSV in a single response, optionally limited to ids between min_id and max_id and hire dates between start_date and end_date (inclusive).
+    """
+    return export_response(table_statement(Employee, min_id, max_id, start_date, end_date), format, "employees")
@@ -3,8 +3,8 @@ from sqlmodel import select
 import logging
 
 from ..models import HealthResponse, S3HealthResponse
-from ..services import S3Service
-from ..db import SessionDep
+from ..services import get_storage
+from ..db import AsyncSessionDep
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,11 +14,11 @@ router = APIRouter()
 
 
 @router.get("/health-db", response_model=HealthResponse, tags=["health checks"])
-async def health_db_check(session: SessionDep):
+async def health_db_check(session: AsyncSessionDep):
     """Health check database connection"""
     try:
         # Test database connection
-        session.exec(select(1))
+        await session.exec(select(1))
         database_connected = True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
@@ -32,11 +32,13 @@ async def health_db_check(session: SessionDep):
 
 @router.get("/health-s3", response_model=S3HealthResponse, tags=["health checks"])
 def health_s3_check():
-    """Health check S3 bucket connection"""
+    """Health check of the storage the CSV files are read from (the S3 bucket, or STORAGE_URI when set)"""
     s3_connected = False
     error = None
     try:
-        bucket_name = S3Service.get_and_validate_s3_bucket_name()
+        storage = get_storage()
+        storage.validate()
+        bucket_name = storage.name
         s3_connected = True
     except Exception as e:
         logger.error(f"S3 connection failed: {e}")
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, status, HTTPException, Query
-from sqlmodel import select
+from fastapi import APIRouter, status, HTTPException, Query, Response
+from typing import Annotated
 import logging
 
-from ..models import Job, BatchResponse
+from ..models import Job, ExportFormat, BatchResponse, IngestionTaskResponse, BatchOptions
 from ..services import DatabaseService
-from ..db import SessionDep
+from ..tasks import IngestionTaskService
+from ..db import AsyncSessionDep, IngestSessionDep
+from ..export import export_response, table_statement
+from ..pagination import MAX_PAGE_LIMIT, list_page
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,14 +16,18 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.post("/jobs/batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED, tags=["jobs"])
-async def batch_upsert_jobs(session: SessionDep):
+@router.post("/jobs/batch", response_model=BatchResponse | IngestionTaskResponse, status_code=status.HTTP_201_CREATED, tags=["jobs"])
+def batch_upsert_jobs(session: IngestSessionDep, response: Response, options: Annotated[BatchOptions, Query()]):
     """
     Batch upsert jobs from CSV files in S3 into the database.
     Creates or updates job records in bulk.
+    With background=true the load runs as a background task and the task is returned immediately.
     """
     try:
-        return DatabaseService.batch_upsert(session, Job)
+        if options.background:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return IngestionTaskService.submit([Job], options)
+        return DatabaseService.batch_upsert(session, Job, options)
 
     except Exception as e:
         logger.error(f"Error processing jobs: {e}")
@@ -28,13 +35,17 @@ async def batch_upsert_jobs(session: SessionDep):
 
 
 @router.get("/jobs", response_model=list[Job], tags=["jobs"])
-async def list_jobs(session: SessionDep, page: int = Query(1, ge=1), limit: int = Query(10, le=100)):
+async def list_jobs(session: AsyncSessionDep, response: Response, page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT), after_id: int | None = None, cursor: str | None = None):
     """
     List jobs with pagination.
+    Pass after_id, or the X-Next-Cursor header of the previous page as cursor, to page by id instead of page number.
     """
-    offset = (page - 1) * limit
-    statement = select(Job).order_by(
-        Job.id).offset(offset).limit(limit)
-    results = session.exec(statement)
-    jobs = results.all()
-    return jobs
+    return await list_page(session, Job, response, page, limit, after_id, cursor)
+
+
+@router.get("/jobs/export", tags=["jobs"])
+def export_jobs(format: ExportFormat = ExportFormat.NDJSON, min_id: int | None = None, max_id: int | None = None):
+    """
+    Stream all jobs as NDJSON or CSV in a single response, optionally limited to ids between min_id and max_id.
+    """
+    return export_response(table_statement(Job, min_id, max_id), format, "jobs")
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 import logging
-from sqlmodel import select
 
-from ..db import SessionDep
-from ..models import VHiredByQuarter2021, VTopHiringDepartments, MetricsResponse
+from ..cache import metrics_cache
+from ..db import AsyncSessionDep
+from ..export import export_response
+from ..models import CacheStatsResponse, ExportFormat, MetricsResponse
+from ..pagination import MAX_PAGE_LIMIT, decode_cursor, encode_cursor
+from ..services import DEFAULT_METRICS_YEAR, MetricsService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,58 +16,134 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/metrics/hired-by-quarter-2021", response_model=MetricsResponse, tags=["metrics"])
-async def hired_by_quarter_2021(session: SessionDep, page: int = Query(1, ge=1), limit: int = Query(10, le=100)):
+def _validate_period(year: int | None, start_date: date | None, end_date: date | None, quarterly: bool = False) -> int:
     """
-    Number of employees hired for each position and department in 2021 divided by quarter.
+    Check the requested period and return the year to report when no date range is given.
+    Quarterly metrics group hires by quarter only, so their date ranges must lie within one calendar year.
     """
-    offset = (page - 1) * limit
+    if start_date is None and end_date is None:
+        return DEFAULT_METRICS_YEAR if year is None else year
+    if year is not None:
+        raise HTTPException(
+            status_code=400, detail="Use either year or start_date/end_date, not both")
+    if start_date is not None and end_date is not None and end_date < start_date:
+        raise HTTPException(
+            status_code=400, detail="end_date must not be before start_date")
+    if quarterly and (start_date is None or end_date is None or start_date.year != end_date.year):
+        raise HTTPException(
+            status_code=400, detail="start_date and end_date must both be given and fall in the same year")
+    return DEFAULT_METRICS_YEAR
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches the ETag of a response."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip().removeprefix("W/")
+                  for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def _cached_response(request: Request, key: tuple, build) -> Response:
+    """
+    Serve a metrics response from the cache, awaiting build() to produce it on a miss.
+    Returns 304 Not Modified when the client already has the current version.
+    """
+    generation, cached = metrics_cache.get(key)
+    if cached is not None:
+        body, etag = cached
+    else:
+        body = (await build()).model_dump_json().encode()
+        etag = metrics_cache.put(generation, key, body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache",
+               "X-Cache": "MISS" if cached is None else "HIT"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/metrics/hired-by-quarter", response_model=MetricsResponse, tags=["metrics"])
+async def hired_by_quarter(request: Request, session: AsyncSessionDep, year: int | None = Query(None, ge=1, le=9999), start_date: date | None = None, end_date: date | None = None, page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT), cursor: str | None = None):
+    """
+    Number of employees hired for each position and department divided by quarter, for a year
+    (2021 by default) or for the hire dates between start_date and end_date (inclusive, in one year).
+    Pass the next_cursor of the previous page as cursor to page without offsets.
+    """
+    year = _validate_period(year, start_date, end_date, quarterly=True)
+    # Department and job names may be NULL
+    after = decode_cursor(cursor, (str, type(None)), (str, type(None))) if cursor is not None else None
+    offset = (page - 1) * limit if after is None else 0
     try:
-        statement = select(VHiredByQuarter2021).offset(offset).limit(limit)
-        result = session.exec(statement)
-        rows = result.all()
-
-        output = [
-            {
-                "department": row.department,
-                "job": row.job,
-                "Q1": row.q1,
-                "Q2": row.q2,
-                "Q3": row.q3,
-                "Q4": row.q4
-            }
-            for row in rows
-        ]
-
-        return MetricsResponse(page=page, limit=limit, count=len(output), data=output)
+        async def build():
+            output = await MetricsService.hired_by_quarter(
+                session, offset, limit, year, start_date, end_date, after)
+            next_cursor = encode_cursor(
+                [output[-1]["department"], output[-1]["job"]]) if len(output) == limit else None
+            return MetricsResponse(page=page, limit=limit, count=len(output), data=output, next_cursor=next_cursor)
+
+        return await _cached_response(request, ("hired-by-quarter", year, start_date, end_date, page, limit, cursor), build)
 
     except Exception as e:
         logger.error(f"Error in hired_by_quarter: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics/hired-by-quarter-2021", response_model=MetricsResponse, tags=["metrics"])
+async def hired_by_quarter_2021(request: Request, session: AsyncSessionDep, page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT), cursor: str | None = None):
+    """
+    Number of employees hired for each position and department in 2021 divided by quarter.
+    Kept for existing clients; same as /metrics/hired-by-quarter?year=2021.
+    """
+    return await hired_by_quarter(request, session, year=2021, start_date=None, end_date=None, page=page, limit=limit, cursor=cursor)
+
+
 @router.get("/metrics/top-hiring-departments", response_model=MetricsResponse, tags=["metrics"])
-async def top_hiring_departments(session: SessionDep, page: int = Query(1, ge=1), limit: int = Query(10, le=100)):
+async def top_hiring_departments(request: Request, session: AsyncSessionDep, year: int | None = Query(None, ge=1, le=9999), start_date: date | None = None, end_date: date | None = None, page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT), cursor: str | None = None):
     """
-    List of ids, names and number of employees hired for each department that hired more employees than the average in 2021.
+    List of ids, names and number of employees hired for each department that hired more employees than the average,
+    for a year (2021 by default) or for the hire dates between start_date and end_date (inclusive).
+    Pass the next_cursor of the previous page as cursor to page without offsets.
     """
+    year = _validate_period(year, start_date, end_date)
+    after = decode_cursor(cursor, int, int) if cursor is not None else None
     try:
-        offset = (page - 1) * limit
-        statement = select(VTopHiringDepartments).offset(offset).limit(limit)
-        result = session.exec(statement)
-        rows = result.all()
-
-        output = [
-            {
-                "id": row.id,
-                "department": row.department,
-                "employees_hired": row.employees_hired
-            }
-            for row in rows
-        ]
-
-        return MetricsResponse(page=page, limit=limit, count=len(output), data=output)
+        offset = (page - 1) * limit if after is None else 0
+
+        async def build():
+            output = await MetricsService.top_hiring_departments(
+                session, offset, limit, year, start_date, end_date, after)
+            next_cursor = encode_cursor(
+                [output[-1]["employees_hired"], output[-1]["id"]]) if len(output) == limit else None
+            return MetricsResponse(page=page, limit=limit, count=len(output), data=output, next_cursor=next_cursor)
+
+        return await _cached_response(request, ("top-hiring-departments", year, start_date, end_date, page, limit, cursor), build)
 
     except Exception as e:
         logger.error(f"Error in top_hiring_departments: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/metrics/hired-by-quarter/export", tags=["metrics"])
+def export_hired_by_quarter(format: ExportFormat = ExportFormat.NDJSON, year: int | None = Query(None, ge=1, le=9999), start_date: date | None = None, end_date: date | None = None):
+    """
+    Stream every row of /metrics/hired-by-quarter as NDJSON or CSV in a single response.
+    """
+    year = _validate_period(year, start_date, end_date, quarterly=True)
+    return export_response(MetricsService.hired_by_quarter_statement(year, start_date, end_date), format, "hired-by-quarter")
+
+
+@router.get("/metrics/top-hiring-departments/export", tags=["metrics"])
+def export_top_hiring_departments(format: ExportFormat = ExportFormat.NDJSON, year: int | None = Query(None, ge=1, le=9999), start_date: date | None = None, end_date: date | None = None):
+    """
+    Stream every row of /metrics/top-hiring-departments as NDJSON or CSV in a single response.
+    """
+    year = _validate_period(year, start_date, end_date)
+    return export_response(MetricsService.top_hiring_departments_statement(year, start_date, end_date), format, "top-hiring-departments")
+
+
+@router.get("/metrics/cache-stats", response_model=CacheStatsResponse, tags=["metrics"])
+async def cache_stats():
+    """
+    Hit and miss counters of the metrics response cache.
+    """
+    return metrics_cache.stats()
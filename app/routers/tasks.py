@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+import logging
+
+from ..models import IngestionTaskResponse
+from ..tasks import IngestionTaskService
+from ..db import AsyncSessionDep
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/tasks/{task_id}", response_model=IngestionTaskResponse, tags=["tasks"])
+async def get_ingestion_task(session: AsyncSessionDep, task_id: str):
+    """
+    Status and progress of a background ingestion task started with background=true.
+    """
+    task = await IngestionTaskService.get(session, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+    return task
@@ -0,0 +1,102 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from sqlmodel import Session
+
+from .db import ingest_engine
+from .models import BatchResponse, FailurePolicy, LoadOptions
+from .services import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+def table_dependencies(model_classes: list) -> dict:
+    """
+    Map each model to the models of the list its table has foreign keys to.
+    Raises ValueError if the foreign keys form a cycle, since no load order would satisfy them.
+    """
+    by_table = {model_class.__tablename__: model_class for model_class in model_classes}
+    dependencies = {
+        model_class: {by_table[foreign_key.column.table.name]
+                      for foreign_key in model_class.__table__.foreign_keys
+                      if foreign_key.column.table.name in by_table and by_table[foreign_key.column.table.name] is not model_class}
+        for model_class in model_classes
+    }
+
+    # Remove tables without pending parents until none are left; anything remaining is a cycle
+    pending = {model_class: set(parents) for model_class, parents in dependencies.items()}
+    while pending:
+        ready = [model_class for model_class, parents in pending.items() if not parents]
+        if not ready:
+            raise ValueError("Foreign keys form a cycle between tables: " +
+                             ", ".join(model_class.__tablename__ for model_class in pending))
+        for model_class in ready:
+            del pending[model_class]
+        for parents in pending.values():
+            parents.difference_update(ready)
+    return dependencies
+
+
+def _load_failed(response: BatchResponse) -> bool:
+    """Whether a load failed as a whole, rather than only rejecting some rows: any file, batch or load error."""
+    return bool(response.errors)
+
+
+def _skipped(model_class, reason: str) -> BatchResponse:
+    return BatchResponse(table=model_class.__tablename__, total=0, inserted=0, updated=0, failed=0,
+                         errors=[{"error": f"Skipped: {reason}"}], processed_files=[], skipped_files=[])
+
+
+def load_tables(model_classes: list, options: LoadOptions, on_failure: FailurePolicy = FailurePolicy.CONTINUE, on_progress=None) -> list[BatchResponse]:
+    """
+    Load several tables, each on its own session, ordered by their foreign keys: tables without
+    pending parents (e.g. Department and Job) load concurrently, and a child (Employee) starts as soon
+    as all its parents have finished. Responses are returned in the order of model_classes.
+
+    When a load fails, FailurePolicy.FAIL_FAST skips the tables that have not started yet, while
+    FailurePolicy.CONTINUE loads them anyway. Exceptions stop scheduling and are re-raised once the
+    running loads finish.
+    """
+    dependencies = table_dependencies(model_classes)
+    pending = {model_class: set(parents) for model_class, parents in dependencies.items()}
+    responses = {}
+    running = {}
+    error = None
+    stop_reason = None
+
+    def load(model_class) -> BatchResponse:
+        with Session(ingest_engine) as session:
+            return DatabaseService.batch_upsert(session, model_class, options, on_progress=on_progress)
+
+    with ThreadPoolExecutor(max_workers=len(model_classes), thread_name_prefix="table-load") as executor:
+        while pending or running:
+            if error is None and stop_reason is None:
+                for model_class in [model_class for model_class, parents in pending.items() if not parents]:
+                    del pending[model_class]
+                    logger.info(f"Starting load of table '{model_class.__tablename__}'")
+                    running[executor.submit(load, model_class)] = model_class
+            else:
+                for model_class in pending:
+                    responses[model_class] = _skipped(model_class, stop_reason or "an earlier table load raised an error")
+                pending.clear()
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                model_class = running.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.error(f"Load of table '{model_class.__tablename__}' raised: {e}")
+                    error = error or e
+                    continue
+                responses[model_class] = response
+                if _load_failed(response) and on_failure == FailurePolicy.FAIL_FAST and stop_reason is None:
+                    stop_reason = f"table '{model_class.__tablename__}' failed"
+                    logger.warning(f"Load of table '{model_class.__tablename__}' failed; skipping the remaining tables")
+                for parents in pending.values():
+                    parents.discard(model_class)
+
+    if error is not None:
+        raise error
+    return [responses[model_class] for model_class in model_classes]
@@ -1,15 +1,107 @@
 import boto3
+import codecs
 import csv
+import io
+import itertools
 import logging
 import os
+import queue
+import threading
+import time
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from io import StringIO
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pydantic import ValidationError
+from sqlalchemy import DateTime, Integer, and_, case, cast, delete, exc, extract, func, insert, literal_column, or_, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+from urllib.parse import urlsplit
 
-from .models import BatchResponse
+from . import instrumentation
+from .batching import BATCH_SIZE, BatchSizer, initial_batch_size
+from .cache import metrics_cache
+from .models import BatchResponse, Department, Employee, HiresRollup, IngestedObject, Job, LoadMode, LoadOptions
+from .pipeline import QUEUE_POLL_SECONDS, iter_queue, put_item, start_stage, timed
+from .references import reference_cache
+from .rejects import REJECT_SPOOLS, RejectCollector
+from .storage import STORAGE_BACKENDS, STORAGE_URI, StorageBackend, storage_from_uri
+from .validation import validate_columns
 
 logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 1000
+# Upper bound for LoadOptions.workers, the number of files processed concurrently
+MAX_INGEST_WORKERS = int(os.getenv("MAX_INGEST_WORKERS", "8"))
+
+# Default number of items buffered between pipeline stages when loading a file
+PIPELINE_QUEUE_DEPTH = int(os.getenv("PIPELINE_QUEUE_DEPTH", "4"))
+
+# Sub-prefixes listed concurrently when a model folder is partitioned (e.g. Employee/2021/)
+S3_LIST_WORKERS = int(os.getenv("S3_LIST_WORKERS", "8"))
+
+# Year reported by the metrics endpoints when none is requested
+DEFAULT_METRICS_YEAR = 2021
+
+# Keys looked up in the ingestedobject manifest per query during incremental loads
+MANIFEST_LOOKUP_SIZE = 1000
+
+# Shared S3 client settings
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+S3_RETRY_MODE = os.getenv("S3_RETRY_MODE", "adaptive")
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "5"))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", "60"))
+
+# Seconds a successful head_bucket check is reused by batch loads and /health-s3
+S3_BUCKET_VALIDATION_TTL = float(os.getenv("S3_BUCKET_VALIDATION_TTL", "60"))
+
+# Bytes requested from S3 per read while streaming a CSV file
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Bytes of rejected rows buffered per part of a multipart upload to S3 (parts must be at least 5 MiB)
+REJECT_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+# Type checks used by the COPY load mode on PostgreSQL versions without pg_input_is_valid
+INTEGER_PATTERN = r"^[-+]?[0-9]+$"
+TIMESTAMP_PATTERN = r"^[0-9]{4}-[0-9]{2}-[0-9]{2}([T ][0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]+)?)?)?(Z|[-+][0-9]{2}(:?[0-9]{2})?)?$"
+
+# Timestamps with a UTC offset, which the COPY load mode converts like the upsert mode binds aware datetimes
+TIMESTAMP_OFFSET_PATTERN = r"[T ][0-9]{2}:[0-9]{2}.*(Z|[-+][0-9]{2}(:?[0-9]{2})?)$"
+
+_s3_client = None
+_s3_lock = threading.Lock()
+_validated_buckets = {}
+_storages = {}
+
+
+class LoadTracker:
+    """
+    State shared by all files of one batch_upsert call, including its worker threads:
+    the caller's progress callback, the batch sizer, the collector of rejected rows and the departments
+    whose employees were written.
+    """
+
+    def __init__(self, on_progress=None, batch_sizer: BatchSizer | None = None, rejects: RejectCollector | None = None):
+        self.on_progress = on_progress
+        self.batch_sizer = batch_sizer or BatchSizer(BATCH_SIZE)
+        self.rejects = rejects or RejectCollector("unknown", uri=None)
+        self.department_ids = set()
+        self.lock = threading.Lock()
+
+    def progress(self, rows: int = 0, failed: int = 0, errors: int = 0, files: int = 0):
+        """Forward progress counts to the caller's callback, if any."""
+        if self.on_progress:
+            self.on_progress(rows=rows, failed=failed,
+                             errors=errors, files=files)
+
+    def rows_written(self, department_ids: Iterable):
+        """Record the department ids of rows written to the database and invalidate cached metrics."""
+        with self.lock:
+            self.department_ids.update(
+                department_id for department_id in department_ids if department_id is not None)
+        metrics_cache.invalidate()
 
 
 class S3Service:
@@ -18,15 +110,39 @@ class S3Service:
     listing CSV files, and reading CSV file contents for migration operations.
     """
     @staticmethod
-    def get_and_validate_s3_bucket_name() -> str:
-        """Validate that S3_BUCKET_NAME environment variable is set."""
+    def client():
+        """
+        Return the S3 client shared by the whole process, creating it on first use.
+        boto3 clients are thread-safe, so workers reuse its connection pool instead of
+        resolving credentials and opening new connections for every call.
+        """
+        global _s3_client
+        if _s3_client is None:
+            with _s3_lock:
+                if _s3_client is None:
+                    _s3_client = boto3.session.Session().client('s3', config=Config(
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        retries={"mode": S3_RETRY_MODE,
+                                 "total_max_attempts": S3_MAX_ATTEMPTS},
+                        connect_timeout=S3_CONNECT_TIMEOUT,
+                        read_timeout=S3_READ_TIMEOUT
+                    ))
+        return _s3_client
+
+    @staticmethod
+    def validate_bucket(bucket_name: str) -> str:
+        """Check that a bucket exists and is accessible, and return its name."""
         try:
-            bucket_name = os.getenv("S3_BUCKET_NAME")
-            if not bucket_name:
-                raise ValueError(
-                    "S3_BUCKET_NAME environment variable is not set")
-            s3 = boto3.client('s3')
-            s3.head_bucket(Bucket=bucket_name)
+            # Skip head_bucket while a previous validation of this bucket is still fresh
+            with _s3_lock:
+                validated_until = _validated_buckets.get(bucket_name, 0)
+            if validated_until > time.monotonic():
+                return bucket_name
+
+            S3Service.client().head_bucket(Bucket=bucket_name)
+            with _s3_lock:
+                _validated_buckets[bucket_name] = time.monotonic() + \
+                    S3_BUCKET_VALIDATION_TTL
             return bucket_name
 
         except ClientError as e:
@@ -43,29 +159,76 @@ class S3Service:
             raise
 
     @staticmethod
-    def list_csv_files(bucket_name: str, prefix: str | None = None) -> list[str]:
-        """List CSV files in the given S3 bucket, optionally filtered by prefix."""
+    def _iter_sub_prefixes(bucket_name: str, sub_prefixes: list[str]) -> Iterator[dict]:
+        """List several prefixes concurrently and yield their CSV objects as pages arrive."""
+        pages = queue.Queue(maxsize=S3_LIST_WORKERS * 2)
+        stop = threading.Event()
+
+        def list_prefix(sub_prefix: str):
+            paginator = S3Service.client().get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=sub_prefix):
+                objects = [obj for obj in page.get(
+                    'Contents', []) if obj['Key'].endswith('.csv')]
+                if objects and not put_item(pages, objects, stop):
+                    return
+
+        executor = ThreadPoolExecutor(max_workers=min(
+            S3_LIST_WORKERS, len(sub_prefixes)), thread_name_prefix="s3-list")
         try:
-            logger.info(f"Listing CSV files in bucket: {bucket_name}" + (
-                f" with prefix: {prefix}" if prefix else ""))
-            s3 = boto3.client('s3')
+            futures = [executor.submit(list_prefix, sub_prefix)
+                       for sub_prefix in sub_prefixes]
+            while True:
+                try:
+                    yield from pages.get(timeout=QUEUE_POLL_SECONDS)
+                except queue.Empty:
+                    if all(future.done() for future in futures) and pages.empty():
+                        break
+            for future in futures:
+                future.result()
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
 
+    @staticmethod
+    def iter_csv_objects(bucket_name: str, prefix: str | None = None) -> Iterator[dict]:
+        """
+        Yield CSV objects in the given S3 bucket, optionally filtered by prefix, following continuation tokens.
+        Sub-prefixes (e.g. date partitions) are listed concurrently. Objects are yielded while the listing
+        is still running; each is a dict with the Key, ETag, Size and LastModified returned by S3.
+        """
+        logger.info(f"Listing CSV files in bucket: {bucket_name}" + (
+            f" with prefix: {prefix}" if prefix else ""))
+        started = time.perf_counter()
+        count = 0
+        try:
+            paginator = S3Service.client().get_paginator('list_objects_v2')
+            params = {"Bucket": bucket_name, "Delimiter": "/"}
             if prefix:
-                response = s3.list_objects_v2(
-                    Bucket=bucket_name, Prefix=prefix)
-            else:
-                response = s3.list_objects_v2(Bucket=bucket_name)
+                params["Prefix"] = prefix
+
+            sub_prefixes = []
+            for page in paginator.paginate(**params):
+                sub_prefixes.extend(common_prefix['Prefix']
+                                    for common_prefix in page.get('CommonPrefixes', []))
+                for obj in page.get('Contents', []):
+                    if obj['Key'].endswith('.csv'):
+                        count += 1
+                        yield obj
 
-            files = [obj['Key'] for obj in response.get(
-                'Contents', []) if obj['Key'].endswith('.csv')]
+            if sub_prefixes:
+                logger.info(
+                    f"Listing {len(sub_prefixes)} sub-prefixes of '{prefix or ''}' concurrently")
+                for obj in S3Service._iter_sub_prefixes(bucket_name, sub_prefixes):
+                    count += 1
+                    yield obj
 
-            if len(files) == 0:
+            if count == 0:
                 logger.warning(f"No CSV files found in bucket '{bucket_name}'" +
                                (f" with prefix '{prefix}'" if prefix else ""))
 
-            logger.info(f"Found {len(files)} CSV files in bucket '{bucket_name}'" +
-                        (f" with prefix '{prefix}'" if prefix else ""))
-            return files
+            logger.info(f"Found {count} CSV files in bucket '{bucket_name}'" +
+                        (f" with prefix '{prefix}'" if prefix else "") +
+                        f" in {time.perf_counter() - started:.2f}s")
 
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -81,19 +244,44 @@ class S3Service:
             raise
 
     @staticmethod
-    def read_csv_file(bucket_name: str, key: str) -> list[list[str]]:
-        """Read a CSV file from S3 and return a list of rows (each row is a list of strings)."""
-        logger.info(f"Reading CSV file from bucket: {bucket_name}, key: {key}")
-        s3 = boto3.client('s3')
-        try:
-            file_obj = s3.get_object(Bucket=bucket_name, Key=key)
-            content = file_obj['Body'].read().decode('utf-8')
+    def _iter_text_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+        """Decode byte chunks incrementally and yield their lines, keeping the line endings."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        pending = ""
+        for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
 
-            # Split into rows and columns (no header)
-            rows = list(csv.reader(StringIO(content)))
-            logger.info(f"Read {len(rows)} rows from file '{key}'")
+    @staticmethod
+    def parse_csv_batches(chunks: Iterable[bytes], batch_size: int | Callable[[], int] = BATCH_SIZE) -> Iterator[list[list[str]]]:
+        """
+        Parse CSV byte chunks and yield lists of at most batch_size rows (each row is a list of strings).
+        batch_size may be a callable, asked for the size of each batch as it starts.
+        """
+        next_size = batch_size if callable(batch_size) else lambda: batch_size
+        size = next_size()
+        batch = []
+        # Rows and columns (no header)
+        for row in csv.reader(S3Service._iter_text_lines(chunks)):
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+                size = next_size()
+        if batch:
+            yield batch
 
-            return rows
+    @staticmethod
+    def get_object_body(bucket_name: str, key: str):
+        """Open an S3 object and return its streaming body without reading it."""
+        logger.info(f"Opening object from bucket: {bucket_name}, key: {key}")
+        try:
+            return S3Service.client().get_object(Bucket=bucket_name, Key=key)['Body']
 
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -108,11 +296,141 @@ class S3Service:
             else:
                 logger.error(f"AWS ClientError: {e}")
                 raise
-        except Exception as e:
-            logger.error(
-                f"Error reading file '{key}' from bucket '{bucket_name}': {str(e)}")
+
+
+class S3Storage(StorageBackend):
+    """Storage backend for an S3 bucket, optionally below a key prefix, using the shared S3 client."""
+
+    def __init__(self, uri: str):
+        parts = urlsplit(uri)
+        self.bucket_name = parts.netloc
+        self.prefix = parts.path.lstrip("/")
+        if self.prefix and not self.prefix.endswith("/"):
+            self.prefix += "/"
+
+    @property
+    def name(self) -> str:
+        return self.bucket_name if not self.prefix else f"s3://{self.bucket_name}/{self.prefix}"
+
+    def validate(self):
+        S3Service.validate_bucket(self.bucket_name)
+
+    def iter_csv_objects(self, prefix: str | None = None) -> Iterator[dict]:
+        # Keys stay full S3 keys, so manifests recorded before storage backends existed still match
+        return S3Service.iter_csv_objects(self.bucket_name, self.prefix + (prefix or ""))
+
+    def open(self, key: str):
+        return S3Service.get_object_body(self.bucket_name, key)
+
+
+STORAGE_BACKENDS["s3"] = S3Storage
+
+
+class S3RejectSpool:
+    """
+    Reject file streamed to S3 with a multipart upload, so at most one part is buffered.
+    Files smaller than one part are written with a single put_object when closed.
+    """
+
+    def __init__(self, uri: str, key: str):
+        parts = urlsplit(uri)
+        self.bucket_name = parts.netloc
+        prefix = parts.path.lstrip("/")
+        self.key = (prefix if not prefix or prefix.endswith("/") else prefix + "/") + key
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+
+    @property
+    def location(self) -> str:
+        return f"s3://{self.bucket_name}/{self.key}"
+
+    def _upload_part(self):
+        client = S3Service.client()
+        if self.upload_id is None:
+            self.upload_id = client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=self.key)['UploadId']
+        part_number = len(self.parts) + 1
+        response = client.upload_part(Bucket=self.bucket_name, Key=self.key, UploadId=self.upload_id,
+                                      PartNumber=part_number, Body=bytes(self.buffer))
+        self.parts.append({"PartNumber": part_number, "ETag": response['ETag']})
+        self.buffer.clear()
+
+    def write(self, data: bytes):
+        self.buffer += data
+        if len(self.buffer) >= REJECT_UPLOAD_PART_SIZE:
+            self._upload_part()
+
+    def close(self):
+        client = S3Service.client()
+        if self.upload_id is None:
+            client.put_object(Bucket=self.bucket_name, Key=self.key, Body=bytes(self.buffer))
+            return
+        try:
+            if self.buffer:
+                self._upload_part()
+            client.complete_multipart_upload(Bucket=self.bucket_name, Key=self.key, UploadId=self.upload_id,
+                                             MultipartUpload={"Parts": self.parts})
+        except Exception:
+            self.abort()
             raise
 
+    def abort(self):
+        """Discard the rows written so far: abort the multipart upload, if one was started."""
+        self.buffer.clear()
+        if self.upload_id is not None:
+            S3Service.client().abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.key, UploadId=self.upload_id)
+
+
+REJECT_SPOOLS["s3"] = S3RejectSpool
+
+
+class CsvCopySource:
+    """
+    File-like view of a CSV body for COPY FROM STDIN, with each row cut or padded to width fields.
+    COPY fails a whole file on one row with another number of fields, while the upsert mode ignores
+    extra fields and leaves missing ones empty; rows read through this source load the same way.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], width: int):
+        self.rows = csv.reader(S3Service._iter_text_lines(chunks))
+        self.width = width
+        self.padding = [""] * width
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+
+    def read(self, size: int = -1) -> bytes:
+        """Return about size bytes of rewritten rows (all of them when size is negative), or b"" at the end."""
+        while size < 0 or self.buffer.tell() < size:
+            rows = list(itertools.islice(self.rows, BATCH_SIZE))
+            if not rows:
+                break
+            self.writer.writerows(
+                row if len(row) == self.width else (row + self.padding)[:self.width] for row in rows)
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+def get_storage() -> StorageBackend:
+    """
+    Storage backend of STORAGE_URI, or of the S3_BUCKET_NAME bucket when it is not set.
+    Backends are created once per URI and shared by all loads.
+    """
+    uri = STORAGE_URI
+    if not uri:
+        bucket_name = os.getenv("S3_BUCKET_NAME")
+        if not bucket_name:
+            raise ValueError(
+                "Neither STORAGE_URI nor S3_BUCKET_NAME environment variable is set")
+        uri = f"s3://{bucket_name}/"
+    with _s3_lock:
+        if uri not in _storages:
+            _storages[uri] = storage_from_uri(uri)
+        return _storages[uri]
+
 
 class DatabaseService:
     """
@@ -129,142 +447,695 @@ class DatabaseService:
         ]
 
     @staticmethod
-    def _process_single_row(session, model_class, field_names: list, row: list) -> tuple[int, int, list]:
-        """Process a single row and return (inserted, updated, errors)."""
-        try:
+    def _error_class(error: Exception) -> str:
+        """Class under which a row rejected with error is counted, e.g. invalid_value:hire_date."""
+        if isinstance(error, ValidationError):
+            columns = sorted({str(detail["loc"][0]) for detail in error.errors() if detail["loc"]})
+            return f"invalid_value:{','.join(columns)}"
+        return f"invalid_row:{type(error).__name__}"
+
+    @staticmethod
+    def _validate_rows(model_class, field_names: list, batch: list, references: dict | None = None) -> tuple[list[dict], list]:
+        """
+        Validate a batch of rows and return (valid_rows, errors). Valid rows are dicts of the set columns.
+        Rows in the common formats are typed column by column; the rest go through model_validate,
+        which decides whether they are accepted and produces the error message.
+        references maps foreign key columns to the ReferencedIds of their parent; rows referencing
+        ids confirmed missing are rejected here, so they do not fail the whole batch in the database.
+        """
+        validated = []
+        errors = []
+        for row, row_data in zip(batch, validate_columns(model_class, field_names, batch)):
+            if row_data is None:
+                try:
+                    cleaned_row = DatabaseService._clean_row_data(row)
+                    validated_data = model_class.model_validate(
+                        dict(zip(field_names, cleaned_row)))
+                    row_data = validated_data.model_dump(exclude_unset=True)
+                except Exception as e:
+                    errors.append({"row": row, "error": str(e),
+                                   "error_class": DatabaseService._error_class(e)})
+                    continue
+            validated.append((row, row_data))
+
+        # Ids absent from the cache are checked in the database once per batch and column
+        missing_ids = {column: referenced.missing(row_data[column] for _, row_data in validated if row_data.get(column) is not None)
+                       for column, referenced in (references or {}).items()}
+        valid_rows = []
+        for row, row_data in validated:
+            missing = {column: f"{column} {row_data[column]} does not exist in {references[column].table_name}"
+                       for column, ids in missing_ids.items() if row_data.get(column) in ids}
+            if missing:
+                errors.append({"row": row, "error": "; ".join(missing.values()),
+                               "error_class": f"missing_reference:{','.join(missing)}"})
+                continue
+            if row_data.get("id") is None:
+                # Let the database assign the id
+                row_data.pop("id", None)
+            valid_rows.append(row_data)
+        return valid_rows, errors
 
-            # Validate data using the model class
-            cleaned_row = DatabaseService._clean_row_data(row)
-            validated_data = model_class.model_validate(
-                dict(zip(field_names, cleaned_row)))
-            # Check if id exists
-            obj = session.get(model_class, validated_data.id)
-            if obj:
-                validated_dict = validated_data.model_dump(
-                    exclude_unset=True, exclude={'id'})
-                obj.sqlmodel_update(validated_dict)
-                session.add(obj)
-                return 0, 1, []  # updated
+    @staticmethod
+    def _dedupe_rows(rows: list[dict]) -> tuple[list[dict], int]:
+        """Keep only the last occurrence of each id in a batch. Returns (rows, duplicates)."""
+        rows_by_id = {}
+        rows_without_id = []
+        for row in rows:
+            if "id" in row:
+                rows_by_id[row["id"]] = row
             else:
-                session.add(validated_data)
-                return 1, 0, []  # inserted
+                rows_without_id.append(row)
+        unique_rows = list(rows_by_id.values()) + rows_without_id
+        return unique_rows, len(rows) - len(unique_rows)
 
-        except Exception as e:
-            # failed
-            return 0, 0, [{"row": row, "error": str(e)}]
+    @staticmethod
+    def _upsert_rows(session, model_class, rows: list[dict]) -> tuple[int, int]:
+        """
+        Upsert validated rows with set-based statements and return (inserted, updated).
+        Uses INSERT ... ON CONFLICT on PostgreSQL and a bulk insert/update fallback elsewhere.
+        """
+        rows, duplicates = DatabaseService._dedupe_rows(rows)
+        inserted = updated = 0
+
+        # A single statement needs the same columns on every row, so group by the set columns
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(row.keys()), []).append(row)
+
+        is_postgresql = session.get_bind().dialect.name == "postgresql"
+        table = model_class.__table__
+        for columns, group in groups.items():
+            if "id" not in columns:
+                session.execute(insert(table), group)
+                inserted += len(group)
+            elif is_postgresql:
+                statement = postgresql.insert(table).values(group)
+                statement = statement.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={column: statement.excluded[column]
+                          for column in columns}
+                ).returning(literal_column("(xmax = 0)"))
+                inserted_flags = session.execute(statement).scalars().all()
+                group_inserted = sum(1 for flag in inserted_flags if flag)
+                inserted += group_inserted
+                updated += len(inserted_flags) - group_inserted
+            else:
+                ids = [row["id"] for row in group]
+                existing_ids = set(session.execute(
+                    select(table.c.id).where(table.c.id.in_(ids))).scalars())
+                to_insert = [row for row in group if row["id"] not in existing_ids]
+                to_update = [row for row in group if row["id"] in existing_ids]
+                if to_insert:
+                    session.execute(insert(model_class), to_insert)
+                if to_update and len(columns) > 1:
+                    session.execute(update(model_class), to_update)
+                inserted += len(to_insert)
+                updated += len(to_update)
+
+        # Repeated ids within a batch overwrite the earlier occurrence
+        return inserted, updated + duplicates
 
     @staticmethod
-    def _process_batch(session, model_class, field_names: list, batch: list, batch_num: int) -> tuple[int, int, int, list]:
-        """Process a batch of rows and return (inserted, updated, failed, errors)."""
-        batch_inserted = batch_updated = batch_failed = 0
-        batch_errors = []
+    def _previous_department_ids(session, model_class, rows: list[dict]) -> list:
+        """Department ids currently stored for the rows about to be updated, so moved rows refresh both departments."""
+        if "department_id" not in model_class.model_fields:
+            return []
+        ids = [row["id"] for row in rows if row.get("id") is not None]
+        if not ids:
+            return []
+        return session.execute(select(model_class.department_id).where(
+            model_class.id.in_(ids)).distinct()).scalars().all()
 
+    @staticmethod
+    def _row_values(model_class, row: dict) -> list:
+        """Values of a validated row in CSV column order, formatted like the file, for error reports."""
+        return ["" if row.get(name) is None else row[name].isoformat() if isinstance(row[name], datetime) else str(row[name])
+                for name in model_class.model_fields]
+
+    @staticmethod
+    def _upsert_isolating_failures(session, model_class, rows: list[dict]) -> tuple[int, int, list[tuple[dict, Exception]]]:
+        """
+        Upsert rows inside a SAVEPOINT, splitting them in halves on constraint or data errors until
+        the failing rows are isolated. Returns (inserted, updated, [(row, error)]) for the rows that failed;
+        the caller commits the rest. k failing rows among n cost O(k log n) statements.
+        """
         try:
-            for row in batch:
-                inserted, updated, errors = DatabaseService._process_single_row(
-                    session, model_class, field_names, row
-                )
-                batch_inserted += inserted
-                batch_updated += updated
-                batch_errors.extend(errors)
-                if errors:
-                    batch_failed += 1
+            with session.begin_nested():
+                inserted, updated = DatabaseService._upsert_rows(
+                    session, model_class, rows)
+            return inserted, updated, []
+        except (exc.IntegrityError, exc.DataError) as e:
+            if len(rows) == 1:
+                return 0, 0, [(rows[0], e.orig)]
+        middle = len(rows) // 2
+        left_inserted, left_updated, left_failures = DatabaseService._upsert_isolating_failures(
+            session, model_class, rows[:middle])
+        right_inserted, right_updated, right_failures = DatabaseService._upsert_isolating_failures(
+            session, model_class, rows[middle:])
+        return left_inserted + right_inserted, left_updated + right_updated, left_failures + right_failures
+
+    @staticmethod
+    def _write_batch(session, model_class, batch: list, valid_rows: list[dict], batch_errors: list, batch_num: int, tracker: LoadTracker | None = None, recover_rows: bool = True) -> tuple[int, int, int, list, bool]:
+        """
+        Write the validated rows of a batch and return (inserted, updated, failed, errors, committed),
+        where committed is False if the batch was rolled back as a whole.
+        If the batch breaks a constraint and recover_rows is set, it is retried with the failing rows
+        isolated through savepoints, so only those rows are lost instead of the whole batch.
+        """
+        batch_failed = len(batch_errors)
+        committed = True
+        started = time.perf_counter()
 
+        try:
+            previous_department_ids = DatabaseService._previous_department_ids(
+                session, model_class, valid_rows) if tracker else []
+            try:
+                batch_inserted, batch_updated = DatabaseService._upsert_rows(
+                    session, model_class, valid_rows)
+            except (exc.IntegrityError, exc.DataError) as e:
+                if not recover_rows or len(valid_rows) < 2:
+                    raise
+                session.rollback()
+                logger.warning(
+                    f"Batch {batch_num}' failed, isolating the failing rows: {e.orig}")
+                previous_department_ids = DatabaseService._previous_department_ids(
+                    session, model_class, valid_rows) if tracker else []
+                batch_inserted, batch_updated, failures = DatabaseService._upsert_isolating_failures(
+                    session, model_class, valid_rows)
+                batch_failed += len(failures)
+                batch_errors = batch_errors + [{"row": DatabaseService._row_values(model_class, row), "error": f"Row failed: {error}".strip(),
+                                                "error_class": f"database:{type(error).__name__}"}
+                                               for row, error in failures]
             session.commit()
+            reference_cache.invalidate(model_class.__tablename__)
             logger.info(
                 f"Batch {batch_num}' committed: {batch_inserted} inserted, {batch_updated} updated")
+            if tracker:
+                tracker.rows_written(itertools.chain(previous_department_ids, (
+                    row.get("department_id") for row in valid_rows)))
 
         except Exception as e:
             session.rollback()
             logger.error(
                 f"Batch {batch_num}' failed and rolled back: {e}")
             batch_failed = len(batch)
-            batch_errors = [{"rows_affected": len(
-                batch), "error": f"Batch failed: {e}"}]
+            batch_errors = batch_errors + [{"rows_affected": len(
+                valid_rows), "error": f"Batch failed: {e}"}]
             batch_inserted = batch_updated = 0
+            committed = False
 
-        return batch_inserted, batch_updated, batch_failed, batch_errors
+        instrumentation.record_write(model_class.__tablename__, batch_inserted,
+                                     batch_updated, batch_failed, time.perf_counter() - started)
+        return batch_inserted, batch_updated, batch_failed, batch_errors, committed
 
     @staticmethod
-    def _process_file(session, model_class, field_names: list, csv_file: str, bucket_name: str) -> tuple[int, int, int, int, list]:
-        """Process a single CSV file and return (total, inserted, updated, failed, errors, processed_files)."""
-        try:
-            logger.info(f"Processing file: {csv_file}")
-            rows = S3Service.read_csv_file(bucket_name, csv_file)
-
-            file_total = len(rows)
-            file_inserted = file_updated = file_failed = 0
-            file_errors = []
+    def _validated_batches(bind, model_class, field_names: list, chunks: Iterable[bytes], batch_size: int | Callable[[], int] = BATCH_SIZE) -> Iterator[tuple[list, list[dict], list]]:
+        """
+        Parse and validate CSV byte chunks, yielding (batch, valid_rows, errors) per batch.
+        Foreign keys are checked against the cached ids of the referenced tables, read through bind.
+        """
+        for batch in S3Service.parse_csv_batches(chunks, batch_size):
+            started = time.perf_counter()
+            valid_rows, errors = DatabaseService._validate_rows(
+                model_class, field_names, batch, reference_cache.references(bind, model_class))
+            instrumentation.record_validation(model_class.__tablename__, len(
+                batch), len(valid_rows), time.perf_counter() - started)
+            yield batch, valid_rows, errors
 
+    @staticmethod
+    def _process_file(session, model_class, field_names: list, csv_file: str, storage: StorageBackend, options: LoadOptions, tracker: LoadTracker) -> tuple[int, int, int, int, list, dict, bool]:
+        """
+        Process a single CSV file and return (total, inserted, updated, failed, errors, stage_timings, loaded).
+        loaded is True only if the file was read to the end and every batch was committed.
+        Download, parse/validate and write run as separate threads connected by bounded queues,
+        unless options.queue_depth is 0.
+        """
+        file_total = file_inserted = file_updated = file_failed = 0
+        file_errors = []
+        file_loaded = True
+        timings = {}
+        queue_depth = PIPELINE_QUEUE_DEPTH if options.queue_depth is None else options.queue_depth
+        stop = threading.Event()
+        stages = []
+        body = None
+        try:
             logger.info(
-                f"Starting batch upsert for file '{csv_file}' with {file_total} rows (batch size: {BATCH_SIZE})")
+                f"Starting batch upsert for file '{csv_file}' (batch size: {tracker.batch_sizer()}{', adaptive' if tracker.batch_sizer.adaptive else ''}, queue depth: {queue_depth})")
+            body = storage.open(csv_file)
+            chunks = timed(instrumentation.count_bytes(body.iter_chunks(STREAM_CHUNK_SIZE), model_class.__tablename__),
+                           timings, "download")
 
-            for batch_start in range(0, file_total, BATCH_SIZE):
-                batch = rows[batch_start:batch_start+BATCH_SIZE]
-                batch_num = batch_start//BATCH_SIZE + 1
+            if queue_depth > 0:
+                # Each queue holds at most queue_depth items, so a slow stage blocks the ones before it
+                chunk_queue = queue.Queue(maxsize=queue_depth)
+                batch_queue = queue.Queue(maxsize=queue_depth)
+                stages.append(start_stage(
+                    f"download-{csv_file}", chunks, chunk_queue, stop))
+                validated = timed(DatabaseService._validated_batches(
+                    session.get_bind(), model_class, field_names, timed(iter_queue(chunk_queue, stop), timings, "parse_validate_wait"), tracker.batch_sizer),
+                    timings, "parse_validate", upstream="parse_validate_wait")
+                stages.append(start_stage(
+                    f"validate-{csv_file}", validated, batch_queue, stop))
+                batches = timed(iter_queue(batch_queue, stop),
+                                timings, "write_wait")
+            else:
+                batches = timed(DatabaseService._validated_batches(session.get_bind(), model_class, field_names, chunks, tracker.batch_sizer),
+                                timings, "parse_validate", upstream="download")
 
+            for batch_num, (batch, valid_rows, errors) in enumerate(batches, start=1):
                 logger.info(
                     f"Processing batch {batch_num} for file '{csv_file}': {len(batch)} rows")
 
-                batch_inserted, batch_updated, batch_failed, batch_errors = DatabaseService._process_batch(
-                    session, model_class, field_names, batch, batch_num
+                write_started = time.perf_counter()
+                batch_inserted, batch_updated, batch_failed, batch_errors, committed = DatabaseService._write_batch(
+                    session, model_class, batch, valid_rows, errors, batch_num, tracker, options.recover_rows
                 )
+                write_seconds = time.perf_counter() - write_started
+                timings["write"] = timings.get("write", 0.0) + write_seconds
+                # Rows failed beyond the validation errors were rejected by the database
+                tracker.batch_sizer.record(
+                    len(batch), write_seconds, batch_failed - len(errors))
 
+                file_total += len(batch)
                 file_inserted += batch_inserted
                 file_updated += batch_updated
                 file_failed += batch_failed
-                file_errors.extend(batch_errors)
+                file_loaded = file_loaded and committed
+                # Rejected rows are spooled as they come; only file and batch errors are kept
+                file_errors.extend(tracker.rejects.add(csv_file, batch_errors))
+                tracker.progress(rows=len(batch), failed=batch_failed,
+                                 errors=len(batch_errors))
 
             logger.info(
-                f"File '{csv_file}' completed. Inserted: {file_inserted}, Updated: {file_updated}, Failed: {file_failed}")
-            return file_total, file_inserted, file_updated, file_failed, file_errors
+                f"File '{csv_file}' completed. Total: {file_total}, Inserted: {file_inserted}, Updated: {file_updated}, Failed: {file_failed}")
+            return file_total, file_inserted, file_updated, file_failed, file_errors, timings, file_loaded
 
+        # Batches committed before a read failure are kept and still reported
         except FileNotFoundError as e:
             logger.error(f"File '{csv_file}' not found: {str(e)}")
-            return 0, 0, 0, 1, [{"file": csv_file, "file_error": str(e)}]
+            return file_total, file_inserted, file_updated, file_failed + 1, file_errors + [{"file": csv_file, "file_error": str(e)}], timings, False
         except Exception as e:
             logger.error(f"Error processing file '{csv_file}': {str(e)}")
-            return 0, 0, 0, 1, [{"file": csv_file, "file_error": str(e)}]
+            return file_total, file_inserted, file_updated, file_failed + 1, file_errors + [{"file": csv_file, "file_error": str(e)}], timings, False
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+            if body is not None:
+                body.close()
+
+    @staticmethod
+    def _staging_check(column, value_sql: str, server_version: tuple) -> str:
+        """Build a SQL predicate that is true when a staged text value can be loaded into the column."""
+        type_name = None
+        if isinstance(column.type, Integer):
+            type_name = "integer"
+            pattern = INTEGER_PATTERN
+        elif isinstance(column.type, DateTime):
+            type_name = "timestamp"
+            pattern = TIMESTAMP_PATTERN
+
+        if type_name is None:
+            type_check = "true"
+        elif server_version >= (16,):
+            type_check = f"pg_input_is_valid({value_sql}, '{type_name}')"
+        elif type_name == "integer":
+            type_check = (f"CASE WHEN {value_sql} ~ '{pattern}' "
+                          f"THEN {value_sql}::numeric BETWEEN -2147483648 AND 2147483647 ELSE false END")
+        else:
+            type_check = f"{value_sql} ~ '{pattern}'"
+
+        # Empty integer primary keys are assigned by the database, as in the upsert mode
+        if column.nullable or (column.primary_key and type_name == "integer"):
+            return f"({value_sql} IS NULL OR {type_check})"
+        return f"({value_sql} IS NOT NULL AND {type_check})"
+
+    @staticmethod
+    def _copy_file(session, model_class, field_names: list, csv_file: str, storage: StorageBackend, options: LoadOptions, tracker: LoadTracker) -> tuple[int, int, int, int, list, dict, bool]:
+        """
+        Load a CSV file through COPY into a temporary staging table and merge it with one statement.
+        Returns (total, inserted, updated, failed, errors, stage_timings, loaded).
+        """
+        timings = {}
+        try:
+            logger.info(f"Processing file with COPY: {csv_file}")
+            connection = session.connection()
+            if connection.dialect.name != "postgresql":
+                raise ValueError("COPY load mode requires a PostgreSQL database")
+
+            quote = connection.dialect.identifier_preparer.quote
+            table = model_class.__table__
+            staging = quote(f"staging_{table.name}")
+            columns = [quote(name) for name in field_names]
+            column_list = ", ".join(columns)
+
+            # Staging columns are text so COPY never rejects a value; type checks happen in SQL
+            connection.exec_driver_sql(
+                f"CREATE TEMP TABLE {staging} ("
+                + ", ".join(f"{column} text" for column in columns)
+                + ", assigned_id integer, line_number bigint GENERATED ALWAYS AS IDENTITY) ON COMMIT DROP")
+
+            copy_started = time.perf_counter()
+            body = storage.open(csv_file)
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                    CsvCopySource(body.iter_chunks(STREAM_CHUNK_SIZE), len(columns)), STREAM_CHUNK_SIZE)
+                file_total = cursor.rowcount
+            finally:
+                cursor.close()
+                body.close()
+            timings["copy"] = time.perf_counter() - copy_started
+            merge_started = time.perf_counter()
+
+            values = {}
+            checks = {}
+            reference_checks = {}
+            referenced_tables = {}
+            server_version = connection.dialect.server_version_info
+            for name, column in zip(field_names, columns):
+                cleaned = f"NULLIF(btrim({column}), '')"
+                table_column = table.c[name]
+                checks[name] = DatabaseService._staging_check(
+                    table_column, cleaned, server_version)
+                if isinstance(table_column.type, Integer):
+                    values[name] = f"{cleaned}::integer"
+                elif isinstance(table_column.type, DateTime):
+                    # Aware values are stored in the session time zone and naive ones as written, as in the upsert mode
+                    values[name] = (f"CASE WHEN {cleaned} ~* '{TIMESTAMP_OFFSET_PATTERN}' "
+                                    f"THEN {cleaned}::timestamptz::timestamp ELSE {cleaned}::timestamp END")
+                else:
+                    values[name] = f"CASE WHEN {cleaned} IS NULL THEN NULL ELSE {column} END"
+                # Rows referencing missing parents are rejected like invalid values instead of failing the merge
+                for foreign_key in table_column.foreign_keys:
+                    parent = foreign_key.column
+                    referenced_tables[name] = parent.table.name
+                    reference_checks[name] = (
+                        f"CASE WHEN {checks[name]} AND {cleaned} IS NOT NULL THEN EXISTS ("
+                        f"SELECT 1 FROM {quote(parent.table.name)} WHERE {quote(parent.name)} = {values[name]}"
+                        f") ELSE true END")
+            all_checks = " AND ".join(
+                list(checks.values()) + list(reference_checks.values()))
+            cleaned_id = f"NULLIF(btrim({quote('id')}), '')"
+
+            # Rejected rows are read through a server-side cursor and spooled a batch at a time
+            rejected = connection.exec_driver_sql(
+                f"SELECT {column_list}, "
+                + ", ".join(f"{check} AS {quote(name + '_ok')}" for name, check in checks.items())
+                + "".join(f", {check} AS {quote(name + '_exists')}" for name, check in reference_checks.items())
+                + f" FROM {staging} WHERE NOT ({all_checks}) ORDER BY line_number",
+                execution_options={"stream_results": True})
+            file_errors = []
+            file_failed = 0
+            for rejected_rows in rejected.partitions(BATCH_SIZE):
+                row_errors = []
+                for rejected_row in rejected_rows:
+                    row = list(rejected_row[:len(field_names)])
+                    invalid = [name for name, ok in zip(
+                        field_names, rejected_row[len(field_names):len(field_names) * 2]) if not ok]
+                    if invalid:
+                        error = f"Invalid value for column(s): {', '.join(invalid)}"
+                        error_class = f"invalid_value:{','.join(invalid)}"
+                    else:
+                        missing = [name for name, exists in zip(
+                            reference_checks, rejected_row[len(field_names) * 2:]) if not exists]
+                        error = "; ".join(
+                            f"{name} {row[field_names.index(name)].strip()} does not exist in {referenced_tables[name]}"
+                            for name in missing)
+                        error_class = f"missing_reference:{','.join(missing)}"
+                    row_errors.append(
+                        {"row": row, "error": error, "error_class": error_class})
+                file_failed += len(row_errors)
+                file_errors.extend(tracker.rejects.add(csv_file, row_errors))
+
+            file_invalid = file_failed
+
+            # Keep the last staged row per id, mirroring the upsert mode. Department ids are
+            # collected before and after the merge so the hires rollup can be refreshed for both.
+            tracks_departments = "department_id" in field_names
+            merged_inserted, merged_total, department_ids = connection.exec_driver_sql(
+                f"WITH deduped AS ("
+                f"SELECT DISTINCT ON (id) {column_list} FROM ("
+                f"SELECT " + ", ".join(f"{values[name]} AS {column}" for name, column in zip(field_names, columns))
+                + f", line_number FROM {staging} WHERE {cleaned_id} IS NOT NULL AND {all_checks}"
+                f") typed ORDER BY id, line_number DESC), "
+                f"merged AS ("
+                f"INSERT INTO {quote(table.name)} ({column_list}) "
+                f"SELECT {column_list} FROM deduped "
+                f"ON CONFLICT (id) DO UPDATE SET "
+                + ", ".join(f"{column} = EXCLUDED.{column}" for column in columns)
+                + " RETURNING (xmax = 0) AS inserted"
+                + (", department_id" if tracks_departments else "") + ") "
+                "SELECT count(*) FILTER (WHERE inserted), count(*), "
+                + (f"(SELECT array_agg(DISTINCT department_id) FROM ("
+                   f"SELECT department_id FROM merged UNION "
+                   f"SELECT existing.department_id FROM {quote(table.name)} existing JOIN deduped USING (id)"
+                   f") affected)" if tracks_departments else "NULL")
+                + " FROM merged").one()
+
+            # Rows without an id take the next value of the table's sequence and are inserted, never merged,
+            # as in the upsert mode. Ids loaded explicitly do not advance the sequence, so it is first moved
+            # past the largest id; a row whose new id is still taken (by a concurrent load) is rejected
+            # instead of overwriting the row holding it.
+            assigned = 0
+            has_missing_ids = connection.exec_driver_sql(
+                f"SELECT EXISTS (SELECT 1 FROM {staging} WHERE {cleaned_id} IS NULL)").scalar()
+            if has_missing_ids:
+                sequence = f"pg_get_serial_sequence('{table.name}', 'id')"
+                connection.exec_driver_sql(
+                    f"SELECT setval({sequence}, max(id)) FROM {quote(table.name)} "
+                    f"HAVING max(id) > COALESCE(pg_sequence_last_value({sequence}::regclass), 0)")
+                assigned = connection.exec_driver_sql(
+                    f"UPDATE {staging} SET assigned_id = nextval({sequence}) "
+                    f"WHERE {cleaned_id} IS NULL AND {all_checks}").rowcount
+            if assigned:
+                taken = f"EXISTS (SELECT 1 FROM {quote(table.name)} existing WHERE existing.id = assigned_id)"
+                collided = connection.exec_driver_sql(
+                    f"SELECT {column_list}, assigned_id FROM {staging} "
+                    f"WHERE assigned_id IS NOT NULL AND {taken} ORDER BY line_number",
+                    execution_options={"stream_results": True})
+                for collided_rows in collided.partitions(BATCH_SIZE):
+                    row_errors = [{"row": list(collided_row[:-1]),
+                                   "error": f"Row failed: id {collided_row[-1]} assigned by the database already exists in {table.name}",
+                                   "error_class": "database:UniqueViolation"} for collided_row in collided_rows]
+                    file_failed += len(row_errors)
+                    file_errors.extend(tracker.rejects.add(csv_file, row_errors))
+                assigned_inserted, assigned_department_ids = connection.exec_driver_sql(
+                    f"WITH inserted AS ("
+                    f"INSERT INTO {quote(table.name)} ({column_list}) "
+                    f"SELECT " + ", ".join("assigned_id" if name == "id" else values[name] for name in field_names)
+                    + f" FROM {staging} WHERE assigned_id IS NOT NULL AND NOT {taken} ORDER BY line_number "
+                    + ("RETURNING department_id" if tracks_departments else "RETURNING NULL AS department_id") + ") "
+                    "SELECT count(*), array_agg(DISTINCT department_id) FROM inserted").one()
+                merged_inserted += assigned_inserted
+                merged_total += assigned_inserted
+                department_ids = (department_ids or []) + (assigned_department_ids or [])
+            session.commit()
+            reference_cache.invalidate(table.name)
+            tracker.rows_written(department_ids or [])
+            timings["merge"] = time.perf_counter() - merge_started
+
+            duplicates = file_total - file_failed - merged_total
+            file_updated = merged_total - merged_inserted + duplicates
+            logger.info(
+                f"File '{csv_file}' completed with COPY. Inserted: {merged_inserted}, Updated: {file_updated}, Failed: {file_failed}")
+            instrumentation.record_validation(
+                table.name, file_total, file_total - file_invalid)
+            instrumentation.record_write(
+                table.name, merged_inserted, file_updated, file_failed)
+            tracker.progress(rows=file_total, failed=file_failed,
+                             errors=file_failed)
+            return file_total, merged_inserted, file_updated, file_failed, file_errors, timings, True
+
+        except FileNotFoundError as e:
+            session.rollback()
+            logger.error(f"File '{csv_file}' not found: {str(e)}")
+            return 0, 0, 0, 1, [{"file": csv_file, "file_error": str(e)}], timings, False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error copying file '{csv_file}': {str(e)}")
+            return 0, 0, 0, 1, [{"file": csv_file, "file_error": str(e)}], timings, False
+
+    @staticmethod
+    def _skip_unchanged_objects(session, objects: Iterable[dict], skipped_files: list) -> Iterator[dict]:
+        """
+        Yield the objects that are new or whose ETag differs from the one recorded when they were last loaded.
+        Keys of unchanged objects are appended to skipped_files. The manifest is queried once per chunk of objects.
+        """
+        objects = iter(objects)
+        while chunk := list(itertools.islice(objects, MANIFEST_LOOKUP_SIZE)):
+            keys = [obj['Key'] for obj in chunk]
+            recorded = dict(session.execute(select(IngestedObject.key, IngestedObject.etag).where(
+                IngestedObject.key.in_(keys))).all())
+            for obj in chunk:
+                if recorded.get(obj['Key']) == obj['ETag']:
+                    skipped_files.append(obj['Key'])
+                else:
+                    yield obj
 
     @staticmethod
-    def batch_upsert(session, model_class) -> BatchResponse:
+    def _record_ingested_object(session, obj: dict, rows_loaded: int):
+        """Store the ETag, size and modification time of a loaded object in the manifest."""
+        last_modified = obj.get('LastModified')
+        if last_modified is not None and last_modified.tzinfo is not None:
+            last_modified = last_modified.astimezone(
+                timezone.utc).replace(tzinfo=None)
+        session.merge(IngestedObject(
+            key=obj['Key'],
+            etag=obj['ETag'],
+            size=obj.get('Size', 0),
+            last_modified=last_modified,
+            rows_loaded=rows_loaded,
+            loaded_at=datetime.now(timezone.utc).replace(tzinfo=None)
+        ))
+        session.commit()
+
+    @staticmethod
+    def _process_objects(session, objects: Iterable[dict], process_file, workers: int, model_class, field_names: list, storage: StorageBackend, options: LoadOptions, tracker: LoadTracker) -> Iterator[tuple[dict, tuple]]:
+        """
+        Process CSV objects as they are listed and yield (object, file_result) in listing order.
+        With more than one worker, files are submitted to a thread pool as soon as they are listed.
+        """
+        if workers <= 1:
+            for obj in objects:
+                yield obj, process_file(session, model_class, field_names, obj['Key'], storage, options, tracker)
+            return
+
+        bind = session.get_bind()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"ingest-{model_class.__name__.lower()}") as executor:
+            futures = deque()
+            listing_error = None
+            try:
+                for obj in objects:
+                    futures.append((obj, executor.submit(DatabaseService._process_file_in_new_session,
+                                                         bind, process_file, model_class, field_names, obj['Key'], storage, options, tracker)))
+                    while futures and futures[0][1].done():
+                        obj, future = futures.popleft()
+                        yield obj, future.result()
+            except Exception as e:
+                # Files already submitted may have committed: report them (and record them in the
+                # manifest) before the listing error ends the load
+                listing_error = e
+            while futures:
+                obj, future = futures.popleft()
+                yield obj, future.result()
+            if listing_error is not None:
+                raise listing_error
+
+    @staticmethod
+    def _process_file_in_new_session(bind, process_file, model_class, field_names: list, csv_file: str, storage: StorageBackend, options: LoadOptions, tracker: LoadTracker) -> tuple[int, int, int, int, list, dict, bool]:
+        """Run process_file for one CSV file on its own session, for use from worker threads."""
+        with Session(bind) as session:
+            return process_file(session, model_class, field_names, csv_file, storage, options, tracker)
+
+    @staticmethod
+    def batch_upsert(session, model_class, options: LoadOptions | None = None, on_progress=None) -> BatchResponse:
         """
         Insert or update rows in batches. If id exists, update; else insert. Returns a summary.
+        With LoadMode.COPY each file is bulk loaded through a staging table instead.
+        With more than one worker, files are processed concurrently, each on its own session.
+        With options.incremental, objects whose ETag is unchanged since they were last loaded are skipped.
+        Upsert batches hold options.batch_size rows (or the table's configured size); with
+        options.adaptive_batch_size the size is tuned while loading toward options.target_commit_seconds.
+        Rejected rows are summarized per error class in error_summary and written in full to a reject file
+        under REJECTS_URI; errors only lists file, batch and load failures.
+        on_progress, if given, is called with keyword counts (rows, failed, errors, files) as work completes,
+        possibly from worker threads.
         """
-        bucket_name = S3Service.get_and_validate_s3_bucket_name()
+        load_started = time.perf_counter()
+        options = options or LoadOptions()
+        tracker = LoadTracker(on_progress, BatchSizer(
+            initial_batch_size(model_class.__tablename__, options.batch_size),
+            options.adaptive_batch_size, options.target_commit_seconds),
+            RejectCollector(model_class.__name__))
+        storage = get_storage()
+        storage.validate()
         table_name = None
         total = inserted = updated = failed = 0
         errors = []
         processed_files = []
+        skipped_files = []
+        stage_timings = {}
+        in_flight = instrumentation.INGEST_IN_FLIGHT.labels(
+            model_class.__tablename__)
+        in_flight.inc()
         try:
             table_name = model_class.__name__.lower()
             prefix = f"{model_class.__name__}/"
             field_names = list(model_class.model_fields.keys())
 
-            # Get CSV files for the model
-            csv_files = S3Service.list_csv_files(bucket_name, prefix)
+            # List CSV files for the model lazily so loading starts before the listing ends
+            csv_objects = timed(storage.iter_csv_objects(
+                prefix), stage_timings, "list")
+            if options.incremental:
+                csv_objects = DatabaseService._skip_unchanged_objects(
+                    session, csv_objects, skipped_files)
 
-            if len(csv_files) == 0:
-                raise ValueError(
-                    f"No CSV files found for folder '{prefix}'")
-                # Process all files
-            for csv_file in csv_files:
-                file_total, file_inserted, file_updated, file_failed, file_errors = DatabaseService._process_file(
-                    session, model_class, field_names, csv_file, bucket_name
-                )
+            # Process all files
+            process_file = DatabaseService._copy_file if options.mode == LoadMode.COPY else DatabaseService._process_file
+            workers = min(options.workers, MAX_INGEST_WORKERS)
+            if workers > 1:
+                logger.info(
+                    f"Processing files for table '{table_name}' with {workers} workers")
+            file_results = DatabaseService._process_objects(
+                session, csv_objects, process_file, workers, model_class, field_names, storage, options, tracker)
+
+            for csv_object, file_result in file_results:
+                csv_file = csv_object['Key']
+                file_total, file_inserted, file_updated, file_failed, file_errors, file_timings, file_loaded = file_result
+                for stage, seconds in file_timings.items():
+                    stage_timings[stage] = stage_timings.get(
+                        stage, 0.0) + seconds
                 total += file_total
                 inserted += file_inserted
                 updated += file_updated
                 failed += file_failed
                 errors.extend(file_errors)
                 processed_files.append(csv_file)
+                # Files that could not be read or had a batch rolled back are retried on the next incremental load
+                if file_loaded:
+                    DatabaseService._record_ingested_object(
+                        session, csv_object, file_total)
+                    instrumentation.record_file(
+                        table_name, "loaded", file_timings)
+                else:
+                    instrumentation.record_file(
+                        table_name, "failed", file_timings)
+                tracker.progress(files=1)
+            instrumentation.record_skipped_files(
+                table_name, len(skipped_files))
+
+            if len(processed_files) == 0 and len(skipped_files) == 0:
+                raise ValueError(
+                    f"No CSV files found for folder '{prefix}'")
 
             logger.info(
-                f"Batch upsert completed for table '{table_name}'. Processed {len(processed_files)} files. Total: {total}, Inserted: {inserted}, Updated: {updated}, Failed: {failed}")
+                f"Batch upsert completed for table '{table_name}'. Processed {len(processed_files)} files, skipped {len(skipped_files)}. Total: {total}, Inserted: {inserted}, Updated: {updated}, Failed: {failed}")
         except Exception as e:
             logger.error(f"Error during batch upsert: {str(e)}")
             errors.append({"error": str(e)})
 
+        # Committed batches are kept even if the load failed later, so the rollup is refreshed either way
+        if model_class is Employee and tracker.department_ids:
+            try:
+                refresh_started = time.perf_counter()
+                MetricsService.refresh_hires_rollup(
+                    session, tracker.department_ids)
+                stage_timings["refresh_metrics"] = time.perf_counter() - \
+                    refresh_started
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error refreshing hires rollup: {str(e)}")
+                errors.append({"error": f"Metrics refresh failed: {e}"})
+
+        rejects_file = tracker.rejects.close()
+        if tracker.rejects.spool_error:
+            errors.append(
+                {"error": f"Rejected rows could not be written to the reject file: {tracker.rejects.spool_error}"})
+
+        in_flight.dec()
+        elapsed = time.perf_counter() - load_started
         return BatchResponse(
             table=table_name,
             total=total,
@@ -272,5 +1143,140 @@ class DatabaseService:
             updated=updated,
             failed=failed,
             errors=errors,
-            processed_files=processed_files
+            error_summary=tracker.rejects.summary(),
+            rejects_file=rejects_file,
+            processed_files=processed_files,
+            skipped_files=skipped_files,
+            stage_timings={stage: round(seconds, 3)
+                           for stage, seconds in stage_timings.items()},
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(total / elapsed, 1) if elapsed else None,
+            # COPY loads write whole files, so they have no batch sizes to report
+            batch_size=tracker.batch_sizer.stats() if tracker.batch_sizer.batches else None
         )
+
+
+class MetricsService:
+    """
+    Service class for the hiring metrics. Metrics are read from the hiresrollup table,
+    which is refreshed after employee loads, so their cost does not grow with the employee table.
+    """
+    @staticmethod
+    def _quarter(column):
+        """SQL expression for the calendar quarter (1-4) of a datetime column."""
+        return (cast(extract("month", column), Integer) - 1) // 3 + 1
+
+    @staticmethod
+    def refresh_hires_rollup(session, department_ids: Iterable[int] | None = None):
+        """
+        Recompute the hires rollup from the employee table and commit. If department_ids is given,
+        only the rows of those departments are recomputed; otherwise the whole rollup is rebuilt.
+        Employees without a department or hire date are not counted, as in the original views.
+        """
+        if department_ids is not None:
+            department_ids = sorted(department_ids)
+            if not department_ids:
+                return
+
+        year = cast(extract("year", Employee.hire_date), Integer)
+        quarter = MetricsService._quarter(Employee.hire_date)
+        hires = select(Employee.department_id, Employee.job_id, year, quarter, func.count()).where(
+            Employee.department_id.is_not(None), Employee.hire_date.is_not(None)
+        ).group_by(Employee.department_id, Employee.job_id, year, quarter)
+        stale = delete(HiresRollup)
+        if department_ids is not None:
+            hires = hires.where(Employee.department_id.in_(department_ids))
+            stale = stale.where(HiresRollup.department_id.in_(department_ids))
+
+        # Concurrent loads refresh the same departments; without the lock the second DELETE would
+        # miss the rows the first one is inserting and both would be counted. The mode conflicts
+        # with itself but not with the metrics reads. SQLite serializes writers anyway
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(text("LOCK TABLE hiresrollup IN SHARE ROW EXCLUSIVE MODE"))
+        session.execute(stale)
+        session.execute(insert(HiresRollup).from_select(
+            ["department_id", "job_id", "year", "quarter", "hires"], hires))
+        session.commit()
+        metrics_cache.invalidate()
+        logger.info(
+            f"Hires rollup refreshed for {'all departments' if department_ids is None else f'{len(department_ids)} departments'}")
+
+    @staticmethod
+    def _hires(year: int, start_date: date | None = None, end_date: date | None = None):
+        """
+        Subquery of (department_id, job_id, quarter, hires). Reads the rollup rows of a year, or,
+        when a date range is given, aggregates the employees hired in it (both ends inclusive).
+        """
+        if start_date is None and end_date is None:
+            return select(HiresRollup.department_id, HiresRollup.job_id, HiresRollup.quarter, HiresRollup.hires).where(
+                HiresRollup.year == year).subquery("hires")
+
+        quarter = MetricsService._quarter(Employee.hire_date)
+        statement = select(Employee.department_id, Employee.job_id, quarter.label("quarter"), func.count().label("hires")).where(
+            Employee.department_id.is_not(None), Employee.hire_date.is_not(None))
+        if start_date is not None:
+            statement = statement.where(Employee.hire_date >= datetime.combine(
+                start_date, datetime.min.time()))
+        if end_date is not None:
+            statement = statement.where(Employee.hire_date < datetime.combine(
+                end_date + timedelta(days=1), datetime.min.time()))
+        return statement.group_by(Employee.department_id, Employee.job_id, quarter).subquery("hires")
+
+    @staticmethod
+    def hired_by_quarter_statement(year: int = DEFAULT_METRICS_YEAR, start_date: date | None = None, end_date: date | None = None, after: list | None = None):
+        """
+        Query of employees hired for each job and department in a year or date range, divided by quarter,
+        ordered by department and job. after, a (department, job) pair, starts after that row.
+        """
+        hires = MetricsService._hires(year, start_date, end_date)
+        quarters = [cast(func.sum(case((hires.c.quarter == quarter, hires.c.hires), else_=0)), Integer).label(f"Q{quarter}")
+                    for quarter in range(1, 5)]
+        statement = select(Department.department, Job.job, *quarters).join(
+            Department, Department.id == hires.c.department_id
+        ).join(
+            Job, Job.id == hires.c.job_id
+        ).group_by(Department.department, Job.job).order_by(Department.department, Job.job)
+        if after is not None:
+            statement = statement.where(
+                tuple_(Department.department, Job.job) > tuple_(*after))
+        return statement
+
+    @staticmethod
+    async def hired_by_quarter(session, offset: int, limit: int, year: int = DEFAULT_METRICS_YEAR, start_date: date | None = None, end_date: date | None = None, after: list | None = None) -> list[dict]:
+        """Page of hired_by_quarter_statement rows as dicts with department, job and Q1..Q4 keys, read with an async session."""
+        statement = MetricsService.hired_by_quarter_statement(
+            year, start_date, end_date, after).offset(offset).limit(limit)
+        return [dict(row._mapping) for row in await session.execute(statement)]
+
+    @staticmethod
+    def top_hiring_departments_statement(year: int = DEFAULT_METRICS_YEAR, start_date: date | None = None, end_date: date | None = None, after: list | None = None):
+        """
+        Query of the departments that hired more employees than the average of all departments in a year
+        or date range, ordered by employees hired. after, an (employees_hired, id) pair, starts after that row.
+        """
+        hires = MetricsService._hires(year, start_date, end_date)
+        department_hires = select(
+            Department.id,
+            Department.department,
+            cast(func.coalesce(func.sum(hires.c.hires), 0), Integer).label("employees_hired")
+        ).outerjoin(
+            hires, hires.c.department_id == Department.id
+        ).group_by(Department.id, Department.department).cte("department_hires")
+        average = select(
+            func.avg(department_hires.c.employees_hired)).scalar_subquery()
+        statement = select(department_hires).where(
+            department_hires.c.employees_hired > average
+        ).order_by(department_hires.c.employees_hired.desc(), department_hires.c.id)
+        if after is not None:
+            hired, department_id = after
+            statement = statement.where(or_(
+                department_hires.c.employees_hired < hired,
+                and_(department_hires.c.employees_hired == hired, department_hires.c.id > department_id)))
+        return statement
+
+    @staticmethod
+    async def top_hiring_departments(session, offset: int, limit: int, year: int = DEFAULT_METRICS_YEAR, start_date: date | None = None, end_date: date | None = None, after: list | None = None) -> list[dict]:
+        """Page of top_hiring_departments_statement rows as dicts with id, department and employees_hired keys, read with an async session."""
+        statement = MetricsService.top_hiring_departments_statement(
+            year, start_date, end_date, after).offset(offset).limit(limit)
+        return [dict(row._mapping) for row in await session.execute(statement)]
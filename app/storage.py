@@ -0,0 +1,231 @@
+import logging
+import mmap
+import os
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from urllib.parse import unquote, urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Where batch loads read their CSV files: s3://bucket/[prefix/], file:///path/ or http(s)://host/path/.
+# Defaults to s3://$S3_BUCKET_NAME/
+STORAGE_URI = os.getenv("STORAGE_URI")
+
+# Timeout in seconds of each request made by the HTTP storage backend
+HTTP_STORAGE_TIMEOUT = float(os.getenv("HTTP_STORAGE_TIMEOUT", "60"))
+
+
+class StorageBackend(ABC):
+    """
+    Location batch loads read CSV files from. Objects are dicts with a Key relative to the location
+    and the ETag, Size and LastModified used by incremental loads, like S3 listings.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Name of the location reported by health checks and logs."""
+
+    @abstractmethod
+    def validate(self):
+        """Check that the location exists and is reachable. Raises FileNotFoundError if it does not exist."""
+
+    @abstractmethod
+    def iter_csv_objects(self, prefix: str | None = None) -> Iterator[dict]:
+        """Yield the CSV objects under prefix, in key order."""
+
+    @abstractmethod
+    def open(self, key: str):
+        """Open an object for streaming. The body has iter_chunks(size), read(size) and close()."""
+
+
+class MappedFileBody:
+    """
+    Body of a local file read through a memory map. iter_chunks yields memoryviews of the mapped pages,
+    so the CSV decoder reads the page cache directly instead of copies made by read() calls.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        # Empty files cannot be mapped
+        self.mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.position = 0
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[memoryview]:
+        view = memoryview(self.mapped)
+        while self.position < self.size:
+            start = self.position
+            self.position = min(start + chunk_size, self.size)
+            yield view[start:self.position]
+
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size is None or size < 0 else min(self.position + size, self.size)
+        data = self.mapped[self.position:end]
+        self.position = end
+        return data
+
+    def close(self):
+        if isinstance(self.mapped, mmap.mmap):
+            try:
+                self.mapped.close()
+            except BufferError:
+                # Chunks still referenced elsewhere keep the map alive until they are released
+                pass
+        self.file.close()
+
+
+class LocalStorage(StorageBackend):
+    """CSV files in a local or mounted (e.g. NFS) directory, read through memory maps."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @property
+    def name(self) -> str:
+        return f"file://{self.root}"
+
+    def validate(self):
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Directory '{self.root}' not found")
+
+    def iter_csv_objects(self, prefix: str | None = None) -> Iterator[dict]:
+        prefix = prefix or ""
+        # Walk the deepest directory the prefix names, then filter on the rest of it
+        directory = os.path.join(self.root, os.path.dirname(prefix))
+        keys = []
+        for path, _, files in os.walk(directory):
+            for file_name in files:
+                key = os.path.relpath(os.path.join(path, file_name), self.root).replace(os.sep, "/")
+                if key.startswith(prefix) and key.endswith(".csv"):
+                    keys.append(key)
+        for key in sorted(keys):
+            stat = os.stat(os.path.join(self.root, key))
+            yield {
+                "Key": key,
+                "ETag": f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+                "Size": stat.st_size,
+                "LastModified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            }
+
+    def open(self, key: str) -> MappedFileBody:
+        path = os.path.join(self.root, key)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"File '{key}' not found in '{self.root}'")
+        return MappedFileBody(path)
+
+
+class _LinkParser(HTMLParser):
+    """Collect the href of every link of an HTML page."""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+
+
+class HttpBody:
+    """Body of an HTTP response, read as it arrives."""
+
+    def __init__(self, response):
+        self.response = response
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        while chunk := self.response.read(chunk_size):
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        return self.response.read(size)
+
+    def close(self):
+        self.response.close()
+
+
+class HttpStorage(StorageBackend):
+    """
+    CSV files served over HTTP(S) by a server with directory listings (nginx autoindex,
+    Apache mod_autoindex, python -m http.server). Sub-directories are listed recursively.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+
+    @property
+    def name(self) -> str:
+        return self.base_url
+
+    def _request(self, url: str, method: str = "GET"):
+        try:
+            return urllib.request.urlopen(urllib.request.Request(url, method=method), timeout=HTTP_STORAGE_TIMEOUT)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                raise FileNotFoundError(f"'{url}' not found")
+            raise
+
+    def validate(self):
+        self._request(self.base_url, "HEAD").close()
+
+    def _iter_keys(self, directory: str) -> Iterator[str]:
+        """Yield the keys of the files listed in a directory page and its sub-directories."""
+        with self._request(urljoin(self.base_url, directory)) as response:
+            parser = _LinkParser()
+            parser.feed(response.read().decode(response.headers.get_content_charset() or "utf-8"))
+        directory_url = urljoin(self.base_url, directory)
+        for href in parser.links:
+            url = urljoin(directory_url, href.split("?")[0].split("#")[0])
+            # Skip parent directories, sort links and links to other hosts
+            if not url.startswith(directory_url) or url == directory_url:
+                continue
+            key = unquote(urlsplit(url).path)[len(urlsplit(self.base_url).path):]
+            if key.endswith("/"):
+                yield from self._iter_keys(key)
+            else:
+                yield key
+
+    def iter_csv_objects(self, prefix: str | None = None) -> Iterator[dict]:
+        prefix = prefix or ""
+        directory = prefix[:prefix.rfind("/") + 1]
+        for key in sorted(set(self._iter_keys(directory))):
+            if not (key.startswith(prefix) and key.endswith(".csv")):
+                continue
+            with self._request(urljoin(self.base_url, key), "HEAD") as response:
+                headers = response.headers
+            last_modified = parsedate_to_datetime(headers["Last-Modified"]) if headers.get("Last-Modified") else None
+            size = int(headers.get("Content-Length") or 0)
+            yield {
+                "Key": key,
+                # Servers without ETags are compared by size and modification time
+                "ETag": headers.get("ETag") or f'"{size:x}-{headers.get("Last-Modified", "")}"',
+                "Size": size,
+                "LastModified": last_modified,
+            }
+
+    def open(self, key: str) -> HttpBody:
+        return HttpBody(self._request(urljoin(self.base_url, key)))
+
+
+# Storage backends by URI scheme. S3Storage is registered by the services module, which owns the S3 client
+STORAGE_BACKENDS = {
+    "file": lambda uri: LocalStorage(unquote(urlsplit(uri).path)),
+    "http": HttpStorage,
+    "https": HttpStorage,
+}
+
+
+def storage_from_uri(uri: str) -> StorageBackend:
+    """Create the storage backend for a file://, s3:// or http(s):// URI."""
+    scheme = urlsplit(uri).scheme
+    if scheme not in STORAGE_BACKENDS:
+        raise ValueError(f"Unsupported storage URI '{uri}'; use one of: " +
+                         ", ".join(f"{name}://" for name in STORAGE_BACKENDS))
+    return STORAGE_BACKENDS[scheme](uri)
@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlmodel import Session
+
+from .db import ingest_engine
+from .models import FailurePolicy, IngestionTask, IngestionTaskResponse, LoadOptions, TaskStatus
+from .scheduler import load_tables
+
+logger = logging.getLogger(__name__)
+
+# Background ingestion tasks that may run at the same time in this process
+INGESTION_TASK_WORKERS = int(os.getenv("INGESTION_TASK_WORKERS", "2"))
+
+# Minimum interval between progress writes to the ingestiontask table
+PROGRESS_FLUSH_SECONDS = 1.0
+
+_executor = ThreadPoolExecutor(
+    max_workers=INGESTION_TASK_WORKERS, thread_name_prefix="ingestion-task")
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class _TaskProgress:
+    """Thread-safe progress counters for a running task, periodically persisted to its row."""
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.started = time.perf_counter()
+        self.last_flush = 0.0
+        self.lock = threading.Lock()
+        self.counts = {"files": 0, "rows": 0, "failed": 0, "errors": 0}
+
+    def __call__(self, rows: int = 0, failed: int = 0, errors: int = 0, files: int = 0):
+        with self.lock:
+            self.counts["rows"] += rows
+            self.counts["failed"] += failed
+            self.counts["errors"] += errors
+            self.counts["files"] += files
+            if time.perf_counter() - self.last_flush >= PROGRESS_FLUSH_SECONDS:
+                self.flush()
+
+    def flush(self, **fields):
+        """Write the current counters and any extra fields to the task row."""
+        self.last_flush = time.perf_counter()
+        with Session(ingest_engine) as session:
+            task = session.get(IngestionTask, self.task_id)
+            task.files_done = self.counts["files"]
+            task.rows_processed = self.counts["rows"]
+            task.rows_failed = self.counts["failed"]
+            task.error_count = self.counts["errors"]
+            task.elapsed_seconds = round(
+                time.perf_counter() - self.started, 3)
+            task.sqlmodel_update(fields)
+            session.add(task)
+            session.commit()
+
+
+class IngestionTaskService:
+    """
+    Service class for running batch upserts as background tasks and reporting their progress.
+    Task state is stored in the ingestiontask table so any API worker can report it.
+    """
+    @staticmethod
+    def submit(model_classes: list, options: LoadOptions, on_failure: FailurePolicy = FailurePolicy.CONTINUE) -> IngestionTaskResponse:
+        """Create a task for loading the given models, in foreign key order, and start it in the background."""
+        task = IngestionTask(
+            id=uuid.uuid4().hex,
+            tables=",".join(model_class.__name__.lower()
+                            for model_class in model_classes),
+            status=TaskStatus.PENDING.value,
+            created_at=_utcnow()
+        )
+        with Session(ingest_engine) as session:
+            session.add(task)
+            session.commit()
+            session.refresh(task)
+            response = IngestionTaskService._to_response(task)
+
+        logger.info(f"Submitting ingestion task {task.id} for tables: {task.tables}")
+        _executor.submit(IngestionTaskService._run,
+                         task.id, model_classes, options, on_failure)
+        return response
+
+    @staticmethod
+    def _run(task_id: str, model_classes: list, options: LoadOptions, on_failure: FailurePolicy):
+        """Run the batch upserts of a task and record the final result."""
+        progress = _TaskProgress(task_id)
+        results = []
+        try:
+            progress.flush(status=TaskStatus.RUNNING.value, started_at=_utcnow())
+            results = load_tables(model_classes, options,
+                                  on_failure, on_progress=progress)
+
+            # Replace the incremental counters with the exact totals
+            with progress.lock:
+                progress.counts = {
+                    "files": sum(len(result.processed_files or []) for result in results),
+                    "rows": sum(result.total for result in results),
+                    "failed": sum(result.failed for result in results),
+                    "errors": sum(len(result.errors) + sum(summary.count for summary in result.error_summary)
+                                  for result in results),
+                }
+                progress.flush(status=TaskStatus.COMPLETED.value, finished_at=_utcnow(),
+                               result=[result.model_dump() for result in results])
+            logger.info(f"Ingestion task {task_id} completed")
+
+        except Exception as e:
+            logger.error(f"Ingestion task {task_id} failed: {e}")
+            with progress.lock:
+                progress.flush(status=TaskStatus.FAILED.value, finished_at=_utcnow(), error=str(e),
+                               result=[result.model_dump() for result in results])
+
+    @staticmethod
+    def _to_response(task: IngestionTask) -> IngestionTaskResponse:
+        """Build the status response for a task, including its throughput."""
+        return IngestionTaskResponse.model_validate(task, update={
+            "rows_per_second": round(task.rows_processed / task.elapsed_seconds, 1) if task.elapsed_seconds else 0
+        })
+
+    @staticmethod
+    async def get(session, task_id: str) -> IngestionTaskResponse | None:
+        """Return the status of a task, read through an async session, or None if it does not exist."""
+        task = await session.get(IngestionTask, task_id)
+        if task is None:
+            return None
+        return IngestionTaskService._to_response(task)
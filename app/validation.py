@@ -0,0 +1,84 @@
+import re
+import types
+import typing
+from datetime import datetime
+from functools import lru_cache
+
+# Values the columnar parsers accept. Anything else is left to pydantic, so both paths
+# always reach the same accept/reject decision.
+INTEGER_RE = re.compile(r"[-+]?[0-9]{1,18}")
+DATETIME_RE = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}[T ][0-9]{2}:[0-9]{2}:[0-9]{2}Z?")
+
+# Marker for values that need the pydantic path
+FALLBACK = object()
+
+
+def _parse_int(value: str):
+    return int(value) if INTEGER_RE.fullmatch(value) else FALLBACK
+
+
+def _parse_datetime(value: str):
+    if not DATETIME_RE.fullmatch(value):
+        return FALLBACK
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return FALLBACK
+
+
+def _parse_str(value: str):
+    return value
+
+
+_PARSERS = {int: _parse_int, datetime: _parse_datetime, str: _parse_str}
+
+
+@lru_cache
+def column_parsers(model_class) -> list[tuple[str, typing.Callable, bool]] | None:
+    """
+    Return (field_name, parser, nullable) for each model field, or None if a field type
+    has no columnar parser and the model must be validated row by row.
+    """
+    parsers = []
+    for name, field in model_class.model_fields.items():
+        annotation = field.annotation
+        nullable = False
+        if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+            args = [arg for arg in typing.get_args(
+                annotation) if arg is not type(None)]
+            nullable = len(args) < len(typing.get_args(annotation))
+            if len(args) != 1:
+                return None
+            annotation = args[0]
+        if annotation not in _PARSERS:
+            return None
+        parsers.append((name, _PARSERS[annotation], nullable))
+    return parsers
+
+
+def validate_columns(model_class, field_names: list, batch: list) -> list[dict | None]:
+    """
+    Validate a batch column by column. Returns, for each row, a dict of typed values or None when the
+    row has to go through pydantic validation (an unusual format, a missing value or a bad value).
+    Empty and whitespace-only strings are treated as missing, like DatabaseService._clean_row_data.
+    """
+    parsers = column_parsers(model_class)
+    width = len(field_names)
+    if parsers is None or [name for name, _, _ in parsers] != field_names:
+        return [None] * len(batch)
+
+    # Only complete rows are handled here; short or long rows fall back to pydantic
+    accepted = [len(row) == width for row in batch]
+    complete = [row if ok else [""] * width for row, ok in zip(batch, accepted)]
+    columns = []
+    for (name, parser, nullable), column in zip(parsers, zip(*complete)):
+        values = [None if value is None or value.strip() == "" else parser(value)
+                  for value in column]
+        for index, value in enumerate(values):
+            if value is FALLBACK or (value is None and not nullable):
+                accepted[index] = False
+        columns.append(values)
+
+    return [dict(zip(field_names, values)) if ok else None
+            for ok, values in zip(accepted, zip(*columns))] if columns else [None] * len(batch)
@@ -0,0 +1,249 @@
+"""
+Ingestion and query benchmark with synthetic data and a local S3 stand-in.
+
+Generates departments, jobs and hired_employees CSVs, serves them from a directory through LocalS3Client,
+loads them with DatabaseService.batch_upsert into a scratch database (recreated on every run) and then
+measures the latency of the list and metrics endpoints in process.
+
+Example:
+    python benchmarks/ingest_benchmark.py --employees 1000000 --employee-files 10 --label baseline --output results.jsonl
+    python benchmarks/ingest_benchmark.py --database-url postgresql+psycopg2://postgres@localhost/bench --mode copy --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from local_s3 import LocalS3Client  # noqa: E402
+
+BUCKET_NAME = "benchmark"
+
+DEFAULT_PATHS = [
+    "/employees?limit=100",
+    "/employees?limit=100&page=50",
+    "/departments",
+    "/metrics/hired-by-quarter?limit=100",
+    "/metrics/top-hiring-departments",
+]
+
+# Hire dates are spread over these years
+HIRE_YEARS = (2019, 2023)
+
+
+def generate_csvs(bucket_path: str, departments: int, jobs: int, employees: int, employee_files: int, invalid_ratio: float, seed: int) -> dict:
+    """Write the CSV files of the three tables under bucket_path, one folder per model. Returns the byte size per table."""
+    rng = random.Random(seed)
+    sizes = {}
+
+    def write(key: str, rows) -> int:
+        path = os.path.join(bucket_path, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="") as output:
+            csv.writer(output).writerows(rows)
+        return os.path.getsize(path)
+
+    sizes["department"] = write("Department/departments.csv",
+                                ([i, f"Department {i}"] for i in range(1, departments + 1)))
+    sizes["job"] = write("Job/jobs.csv",
+                         ([i, f"Job {i}"] for i in range(1, jobs + 1)))
+
+    start = datetime(HIRE_YEARS[0], 1, 1, tzinfo=timezone.utc)
+    span = int((datetime(HIRE_YEARS[1], 1, 1, tzinfo=timezone.utc) - start).total_seconds())
+
+    def employee_rows(first: int, last: int):
+        for i in range(first, last):
+            if rng.random() < invalid_ratio:
+                hire_date = "not-a-date"
+            else:
+                hire_date = (start + timedelta(seconds=rng.randrange(span))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            yield [i, f"Employee {i}", hire_date, rng.randint(1, departments), rng.randint(1, jobs)]
+
+    sizes["employee"] = 0
+    per_file = -(-employees // employee_files)
+    for number, first in enumerate(range(1, employees + 1, per_file), start=1):
+        last = min(first + per_file, employees + 1)
+        sizes["employee"] += write(f"Employee/hired_employees_{number:04d}.csv",
+                                   employee_rows(first, last))
+    return sizes
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run_loads(options) -> list[dict]:
+    """Load the three tables in dependency order, returning throughput and stage timings of each load."""
+    from sqlmodel import Session
+    from app.db import ingest_engine
+    from app.models import Department, Employee, Job
+    from app.services import DatabaseService
+
+    results = []
+    for model_class in (Department, Job, Employee):
+        with Session(ingest_engine) as session:
+            started = time.perf_counter()
+            response = DatabaseService.batch_upsert(session, model_class, options)
+            elapsed = time.perf_counter() - started
+        results.append({
+            "table": response.table,
+            "files": len(response.processed_files or []),
+            "rows": response.total,
+            "inserted": response.inserted,
+            "updated": response.updated,
+            "failed": response.failed,
+            "errors": len(response.errors),
+            "error_classes": {summary.error_class: summary.count for summary in response.error_summary},
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(response.total / elapsed, 1) if elapsed else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "stage_timings": response.stage_timings,
+            "batch_size": response.batch_size.model_dump() if response.batch_size else None,
+        })
+        print(f"Loaded {response.table}: {response.total} rows in {elapsed:.2f}s", file=sys.stderr)
+    return results
+
+
+def measure_endpoints(paths: list[str], requests: int) -> dict:
+    """Request each path sequentially in process and report its latency percentiles."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    results = {}
+    with TestClient(app) as client:
+        for path in paths:
+            client.get(path)
+            latencies = []
+            errors = 0
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code >= 400
+            latencies.sort()
+            results[path] = {
+                "requests": requests,
+                "errors": errors,
+                "latency_ms": {
+                    "mean": round(statistics.fmean(latencies) * 1000, 2),
+                    "p50": round(percentile(latencies, 0.5) * 1000, 2),
+                    "p99": round(percentile(latencies, 0.99) * 1000, 2),
+                },
+            }
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--departments", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--employee-files", type=int, default=1,
+                        help="Number of CSV files the employees are split into")
+    parser.add_argument("--invalid-ratio", type=float, default=0.01,
+                        help="Fraction of employee rows with an invalid hire date")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=None,
+                        help="Directory for the generated CSVs (default: a temporary directory)")
+    parser.add_argument("--database-url", default=None,
+                        help="Scratch database, dropped and recreated (default: a temporary SQLite file)")
+    parser.add_argument("--storage", choices=["s3", "file"], default="s3",
+                        help="Read the CSVs through the S3 code path with LocalS3Client, or directly with the file:// backend")
+    parser.add_argument("--mode", choices=["upsert", "copy"], default="upsert")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Rows per upsert batch (default: the configured size of each table)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Tune the batch size while loading toward --target-commit-seconds")
+    parser.add_argument("--target-commit-seconds", type=float, default=None)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Requests per endpoint for the latency measurement, 0 to skip it")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="Endpoint to measure; repeat for several (default: list and metrics endpoints)")
+    parser.add_argument("--metrics-cache", action="store_true",
+                        help="Keep the metrics response cache enabled while measuring latency")
+    parser.add_argument("--label", default=None, help="Name of the run")
+    parser.add_argument("--output", default=None,
+                        help="Append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix="ingest-benchmark-")
+    data_dir = args.data_dir or temp_dir
+    database_url = args.database_url or f"sqlite:///{os.path.join(temp_dir, 'benchmark.db')}"
+
+    # The app reads its configuration when it is imported
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["S3_BUCKET_NAME"] = BUCKET_NAME
+    if args.storage == "file":
+        os.environ["STORAGE_URI"] = f"file://{os.path.join(os.path.abspath(data_dir), BUCKET_NAME)}"
+    if not args.metrics_cache:
+        os.environ["METRICS_CACHE_SIZE"] = "0"
+
+    started = time.perf_counter()
+    sizes = generate_csvs(os.path.join(data_dir, BUCKET_NAME), args.departments, args.jobs,
+                          args.employees, args.employee_files, args.invalid_ratio, args.seed)
+    generate_seconds = time.perf_counter() - started
+
+    from sqlmodel import SQLModel
+    import app.services
+    from app.db import engine
+    from app.models import LoadMode, LoadOptions
+
+    app.services._s3_client = LocalS3Client(data_dir)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    loads = run_loads(LoadOptions(mode=LoadMode(args.mode), workers=args.workers, batch_size=args.batch_size,
+                                  adaptive_batch_size=args.adaptive, target_commit_seconds=args.target_commit_seconds))
+    endpoints = measure_endpoints(args.paths or DEFAULT_PATHS, args.requests) if args.requests else {}
+
+    result = {
+        "label": args.label,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "scale": {"departments": args.departments, "jobs": args.jobs, "employees": args.employees,
+                  "employee_files": args.employee_files, "invalid_ratio": args.invalid_ratio},
+        "options": {"storage": args.storage, "mode": args.mode, "workers": args.workers, "batch_size": args.batch_size,
+                    "adaptive": args.adaptive, "target_commit_seconds": args.target_commit_seconds, "metrics_cache": args.metrics_cache},
+        "csv_bytes": sizes,
+        "generate_seconds": round(generate_seconds, 3),
+        "loads": loads,
+        "peak_rss_mb": peak_rss_mb(),
+        "endpoints": endpoints,
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "a") as output:
+            output.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Concurrent load test for the read endpoints of a running API.
+
+Example:
+    python benchmarks/load_test.py --url http://localhost:8000 --clients 50 --duration 20 --label async
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/employees?limit=100",
+    "/departments",
+    "/metrics/hired-by-quarter?limit=100",
+    "/metrics/top-hiring-departments",
+    "/health-db",
+]
+
+
+async def run_client(client: httpx.AsyncClient, paths: list[str], deadline: float, latencies: list[float], errors: list[int], offset: int):
+    """Request the paths in turn until the deadline, recording the latency of each request."""
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(url: str, paths: list[str], clients: int, duration: float) -> dict:
+    """Run clients concurrent request loops for duration seconds and summarize the results."""
+    latencies = []
+    errors = []
+    limits = httpx.Limits(max_connections=clients,
+                          max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(run_client(client, paths, deadline, latencies, errors, offset)
+                               for offset in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "duration_seconds": round(elapsed, 2),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 1) if latencies else None,
+            "p50": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            "p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+            "p99": round(latencies[int(len(latencies) * 0.99)] * 1000, 1) if latencies else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="Endpoint to request; repeat for several (default: list, metrics and health endpoints)")
+    parser.add_argument("--label", default=None,
+                        help="Name of the run, e.g. sync or async")
+    parser.add_argument("--output", default=None,
+                        help="Append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run(args.url, args.paths or DEFAULT_PATHS, args.clients, args.duration))
+    result = {"label": args.label, "url": args.url, **result}
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "a") as output:
+            output.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
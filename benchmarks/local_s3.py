@@ -0,0 +1,97 @@
+"""
+Filesystem-backed stand-in for the boto3 S3 client, so loads can be benchmarked without AWS or moto.
+
+A bucket is a directory under the root and object keys are paths relative to it. Only the calls
+made by S3Service are implemented: head_bucket, list_objects_v2 (paginated, with Delimiter) and get_object.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+
+# Keys per list_objects_v2 page, as returned by S3
+PAGE_SIZE = 1000
+
+
+def _client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+class LocalS3Client:
+    """Serve the directories under root as S3 buckets."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _bucket_path(self, bucket: str, operation: str) -> str:
+        path = os.path.join(self.root, bucket)
+        if not os.path.isdir(path):
+            raise _client_error(
+                "404" if operation == "HeadBucket" else "NoSuchBucket", operation)
+        return path
+
+    def head_bucket(self, Bucket: str) -> dict:
+        self._bucket_path(Bucket, "HeadBucket")
+        return {}
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        path = os.path.join(self._bucket_path(Bucket, "GetObject"), Key)
+        if not os.path.isfile(path):
+            raise _client_error("NoSuchKey", "GetObject")
+        size = os.path.getsize(path)
+        return {"Body": StreamingBody(open(path, "rb"), size), "ContentLength": size}
+
+    def get_paginator(self, operation: str) -> "LocalPaginator":
+        if operation != "list_objects_v2":
+            raise NotImplementedError(operation)
+        return LocalPaginator(self)
+
+    def list_keys(self, bucket: str) -> list[str]:
+        """All keys of a bucket in lexicographic order, like S3 listings."""
+        bucket_path = self._bucket_path(bucket, "ListObjectsV2")
+        keys = []
+        for directory, _, files in os.walk(bucket_path):
+            for name in files:
+                keys.append(os.path.relpath(os.path.join(
+                    directory, name), bucket_path).replace(os.sep, "/"))
+        return sorted(keys)
+
+    def describe(self, bucket: str, key: str) -> dict:
+        """Listing entry of an object. The ETag is derived from its size and modification time."""
+        stat = os.stat(os.path.join(self.root, bucket, key))
+        return {
+            "Key": key,
+            "Size": stat.st_size,
+            "ETag": '"' + hashlib.md5(f"{key}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest() + '"',
+            "LastModified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+        }
+
+
+class LocalPaginator:
+    """list_objects_v2 paginator over a LocalS3Client bucket."""
+
+    def __init__(self, client: LocalS3Client):
+        self.client = client
+
+    def paginate(self, Bucket: str, Prefix: str = "", Delimiter: str | None = None):
+        contents = []
+        common_prefixes = []
+        for key in self.client.list_keys(Bucket):
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                common_prefix = Prefix + rest.split(Delimiter)[0] + Delimiter
+                if common_prefix not in common_prefixes:
+                    common_prefixes.append(common_prefix)
+                continue
+            contents.append(self.client.describe(Bucket, key))
+
+        for start in range(0, max(len(contents), 1), PAGE_SIZE):
+            page = {"Contents": contents[start:start + PAGE_SIZE]}
+            if start == 0 and common_prefixes:
+                page["CommonPrefixes"] = [{"Prefix": common_prefix}
+                                          for common_prefix in common_prefixes]
+            yield page
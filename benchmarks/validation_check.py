@@ -0,0 +1,125 @@
+"""
+Differential check of the columnar validation fast path against pydantic.
+
+app.validation.validate_columns types most rows with regexes and datetime.fromisoformat and only sends
+the rest to model_validate. Every row it accepts must be accepted by model_validate with identical
+values, otherwise loads would store something pydantic would have rejected or converted differently.
+This script feeds Department, Job and Employee rows built from edge-case values (leading zeros, signs,
+19+ digit integers, Z and offset timestamps, impossible dates, whitespace-only fields, short and long
+rows) through both paths and exits with status 1 on the first divergences it finds.
+
+Example:
+    python benchmarks/validation_check.py --rows 200000 --seed 7
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from app.models import Department, Employee, Job  # noqa: E402
+from app.services import DatabaseService  # noqa: E402
+from app.validation import validate_columns  # noqa: E402
+
+INTEGER_VALUES = [
+    "0", "1", "42", "007", "+5", "-3", "-0", "+0", " 12", "12 ", "1.0", "1e3", "0x10", "1_000",
+    "9" * 18, "1" + "0" * 18, "9" * 19, "-" + "9" * 19, "2147483648", "99999999999999999999",
+    "٣", "１", "", " ", "\t", "abc", "None",
+]
+DATETIME_VALUES = [
+    "2021-01-07T02:48:42Z", "2021-01-07T02:48:42", "2021-01-07 02:48:42", "2021-01-07 02:48:42Z",
+    "2021-01-07T02:48:42+02:00", "2021-01-07T02:48:42-0500", "2021-01-07T02:48:42.123Z",
+    "2021-01-07T02:48:42.123456", "2021-01-07T02:48", "2021-01-07", "2021-02-30T00:00:00Z",
+    "2020-02-29T00:00:00Z", "2021-02-29T00:00:00Z", "2021-13-01T00:00:00Z", "2021-01-07T24:00:00Z",
+    "2021-01-07T23:59:60Z", "0001-01-01T00:00:00Z", "9999-12-31T23:59:59Z", "2021-1-7T02:48:42Z",
+    " 2021-01-07T02:48:42Z", "2021-01-07T02:48:42Z ", "20210107T024842Z", "1610000000", "1610000000.5",
+    "2021-01-07t02:48:42z", "", " ", "not-a-date",
+]
+STRING_VALUES = ["Sales", "", " ", "  ", " padded ", "ñandú", "a,b", "\"quoted\"", "0", "None"]
+
+VALUES = {int: INTEGER_VALUES, datetime: DATETIME_VALUES, str: STRING_VALUES}
+
+
+def field_values(model_class) -> list[list[str]]:
+    """Candidate CSV values for each field of a model, chosen from its annotation."""
+    candidates = []
+    for field in model_class.model_fields.values():
+        annotation = field.annotation
+        for kind in (datetime, int, str):
+            if annotation is kind or kind in getattr(annotation, "__args__", ()):
+                candidates.append(VALUES[kind])
+                break
+    return candidates
+
+
+def generate_rows(model_class, count: int, rng: random.Random) -> list[list[str]]:
+    """Every single-field variation of a valid row, then random rows, including short and long ones."""
+    candidates = field_values(model_class)
+    base = [values[0] for values in candidates]
+    rows = []
+    for index, values in enumerate(candidates):
+        for value in values:
+            rows.append(base[:index] + [value] + base[index + 1:])
+    rows += [base[:-1], base + ["extra"], [], [""] * (len(base) + 1)]
+    for _ in range(count):
+        row = [rng.choice(values) for values in candidates]
+        width = rng.random()
+        if width < 0.05:
+            row = row[:rng.randrange(len(row))]
+        elif width < 0.1:
+            row += [rng.choice(STRING_VALUES)]
+        rows.append(row)
+    return rows
+
+
+def comparable(values: dict) -> dict:
+    """Values with their types and, for datetimes, their UTC offsets, so equal instants in different zones differ."""
+    return {name: (value, type(value), value.utcoffset() if isinstance(value, datetime) else None)
+            for name, value in values.items()}
+
+
+def check(model_class, rows: list[list[str]], batch_size: int) -> list[tuple]:
+    """Return (row, columnar values, pydantic result) for each row the fast path accepts differently."""
+    field_names = list(model_class.model_fields.keys())
+    divergences = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        for row, row_data in zip(batch, validate_columns(model_class, field_names, batch)):
+            if row_data is None:
+                # Rows the fast path does not accept go through model_validate, as in DatabaseService._validate_rows
+                continue
+            try:
+                expected = model_class.model_validate(dict(zip(field_names, DatabaseService._clean_row_data(row)))).model_dump(exclude_unset=True)
+            except Exception as e:
+                divergences.append((row, row_data, f"rejected by pydantic: {e}"))
+                continue
+            if comparable(row_data) != comparable(expected):
+                divergences.append((row, row_data, expected))
+    return divergences
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000,
+                        help="Random rows per model, in addition to the single-field variations")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+    for model_class in (Department, Job, Employee):
+        rows = generate_rows(model_class, args.rows, rng)
+        divergences = check(model_class, rows, args.batch_size)
+        print(f"{model_class.__name__}: {len(rows)} rows, {len(divergences)} divergences")
+        for row, columnar, expected in divergences[:10]:
+            print(f"  row {row!r}\n    columnar: {columnar!r}\n    pydantic: {expected!r}")
+        failed = failed or bool(divergences)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()